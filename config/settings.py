@@ -4,38 +4,57 @@ Loads from environment variables and .env file.
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, FrozenSet, List, Optional, Set
 
-from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load .env file explicitly
+# Resolve .env relative to the project root rather than the working directory
 env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(env_path)
 
 
-class Settings(BaseSettings):
-    """Main settings class with all configuration."""
+# Every settings model reads the same environment and .env file
+_ENV_CONFIG = SettingsConfigDict(
+    env_file=str(env_path),
+    env_file_encoding="utf-8",
+    extra="ignore",
+)
+
+
+class AACTSettings(BaseSettings):
+    """AACT database credentials, resolved only when a run needs AACT."""
+
+    model_config = _ENV_CONFIG
+
+    host: str = Field(default="aact-db.ctti-clinicaltrials.org", alias="AACT_HOST")
+    port: int = Field(default=5432, alias="AACT_PORT")
+    database: str = Field(default="aact", alias="AACT_DATABASE")
+    user: str = Field(default="", alias="AACT_USER")
+    password: str = Field(default="", alias="AACT_PASSWORD")
+
+    @property
+    def connection_string(self) -> str:
+        """Build PostgreSQL connection string for AACT (psycopg2 driver: the extractor uses its COPY and executemany options)."""
+        return f"postgresql+psycopg2://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore",
-    )
 
-    # AACT Database
-    aact_host: str = Field(default="aact-db.ctti-clinicaltrials.org", alias="AACT_HOST")
-    aact_port: int = Field(default=5432, alias="AACT_PORT")
-    aact_database: str = Field(default="aact", alias="AACT_DATABASE")
-    aact_user: str = Field(default="", alias="AACT_USER")
-    aact_password: str = Field(default="", alias="AACT_PASSWORD")
+class Neo4jSettings(BaseSettings):
+    """Neo4j credentials, resolved only when a run needs Neo4j."""
 
-    # Neo4j Database
-    neo4j_uri: str = Field(default="bolt://localhost:7687", alias="NEO4J_URI")
-    neo4j_user: str = Field(default="neo4j", alias="NEO4J_USER")
-    neo4j_password: str = Field(default="password", alias="NEO4J_PASSWORD")
+    model_config = _ENV_CONFIG
+
+    uri: str = Field(default="bolt://localhost:7687", alias="NEO4J_URI")
+    user: str = Field(default="neo4j", alias="NEO4J_USER")
+    password: str = Field(default="password", alias="NEO4J_PASSWORD")
+
+
+class Settings(BaseSettings):
+    """Settings every run needs: data paths, extraction and logging."""
+
+    model_config = _ENV_CONFIG
 
     # Data paths
     data_raw_path: Path = Field(default=Path("./data/raw"), alias="DATA_RAW_PATH")
@@ -54,124 +73,97 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
-    @property
-    def aact_connection_string(self) -> str:
-        """Build PostgreSQL connection string for AACT."""
-        return f"postgresql://{self.aact_user}:{self.aact_password}@{self.aact_host}:{self.aact_port}/{self.aact_database}"
+    @cached_property
+    def phase_set(self) -> FrozenSet[str]:
+        """Extraction phases as a frozenset for O(1) membership tests."""
+        return frozenset(self.extraction_phases)
 
     def ensure_data_paths_exist(self) -> None:
         """Create data directories if they don't exist."""
-        for path in [self.data_raw_path, self.data_staged_path, self.data_graph_path]:
-            path.mkdir(parents=True, exist_ok=True)
+        _ensure_paths_exist(self.data_raw_path, self.data_staged_path, self.data_graph_path)
 
 
-# Wrapper classes for backward compatibility with extractor
-class AACTSettings:
-    """AACT settings wrapper."""
-    def __init__(self, settings: Settings):
-        self._settings = settings
-    
-    @property
-    def host(self) -> str:
-        return self._settings.aact_host
-    
-    @property
-    def port(self) -> int:
-        return self._settings.aact_port
-    
-    @property
-    def database(self) -> str:
-        return self._settings.aact_database
-    
-    @property
-    def user(self) -> str:
-        return self._settings.aact_user
-    
-    @property
-    def password(self) -> str:
-        return self._settings.aact_password
-    
-    @property
-    def connection_string(self) -> str:
-        return self._settings.aact_connection_string
+# Directories already created by this process
+_ensured: Set[Path] = set()
 
 
-class DataSettings:
-    """Data settings wrapper."""
-    def __init__(self, settings: Settings):
-        self._settings = settings
-    
-    @property
-    def raw_path(self) -> Path:
-        return self._settings.data_raw_path
-    
-    @raw_path.setter
-    def raw_path(self, value: Path) -> None:
-        self._settings.data_raw_path = value
-    
-    @property
-    def staged_path(self) -> Path:
-        return self._settings.data_staged_path
-    
-    @property
-    def graph_path(self) -> Path:
-        return self._settings.data_graph_path
-    
-    def ensure_paths_exist(self) -> None:
-        self._settings.ensure_data_paths_exist()
+def _ensure_paths_exist(*paths: Path) -> None:
+    """Create each directory (and its parents) once per process."""
+    for path in paths:
+        path = Path(path)
+        if path in _ensured:
+            continue
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured.add(path)
 
 
-class ExtractionSettings:
-    """Extraction settings wrapper."""
-    def __init__(self, settings: Settings):
-        self._settings = settings
-    
-    @property
-    def limit(self) -> Optional[int]:
-        return self._settings.extraction_limit
-    
-    @limit.setter
-    def limit(self, value: Optional[int]) -> None:
-        self._settings.extraction_limit = value
-    
-    @property
-    def phases(self) -> List[str]:
-        return self._settings.extraction_phases
-    
-    @property
-    def intervention_types(self) -> List[str]:
-        return self._settings.extraction_intervention_types
+class DataPaths:
+    """Data directories of the pipeline."""
 
+    def __init__(self, raw_path: Path, staged_path: Path, graph_path: Path):
+        self.raw_path = raw_path
+        self.staged_path = staged_path
+        self.graph_path = graph_path
 
-class Neo4jSettings:
-    """Neo4j settings wrapper."""
-    def __init__(self, settings: Settings):
-        self._settings = settings
-    
-    @property
-    def uri(self) -> str:
-        return self._settings.neo4j_uri
-    
-    @property
-    def user(self) -> str:
-        return self._settings.neo4j_user
-    
-    @property
-    def password(self) -> str:
-        return self._settings.neo4j_password
+    def ensure_paths_exist(self) -> None:
+        """Create data directories if they don't exist."""
+        _ensure_paths_exist(self.raw_path, self.staged_path, self.graph_path)
 
 
 class SettingsWrapper:
-    """Wrapper providing the expected interface for the extractor."""
-    def __init__(self):
-        self._settings = Settings()
-        self.aact = AACTSettings(self._settings)
-        self.data = DataSettings(self._settings)
-        self.extraction = ExtractionSettings(self._settings)
-        self.neo4j = Neo4jSettings(self._settings)
-        self.log_level = self._settings.log_level
-
-
-def get_settings() -> SettingsWrapper:
-    """Get settings instance."""
-    return SettingsWrapper()
+    """
+    Grouped view over Settings providing the interface the pipeline expects.
+
+    Each group is populated once, so reads are simple attribute lookups.
+    The credential groups (``aact``, ``neo4j``) are separate settings
+    models read from the environment on first access, so runs that never
+    touch a database (e.g. transform_data.py) never resolve or validate
+    its credentials. The wrapper holds no closures, so it pickles.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, overrides: Optional[Dict[str, Any]] = None):
+        self._overrides = overrides or {}
+        if settings is None:
+            # Each settings model picks the overrides for its own fields
+            settings = Settings(**self._overrides)
+        self.data = DataPaths(
+            raw_path=settings.data_raw_path,
+            staged_path=settings.data_staged_path,
+            graph_path=settings.data_graph_path,
+        )
+        self.extraction = SimpleNamespace(
+            limit=settings.extraction_limit,
+            phases=settings.extraction_phases,
+            phase_set=settings.phase_set,
+            intervention_types=settings.extraction_intervention_types,
+        )
+        self.log_level = settings.log_level
+
+    @cached_property
+    def aact(self) -> AACTSettings:
+        """AACT database settings, resolved on first access."""
+        return AACTSettings(**self._overrides)
+
+    @cached_property
+    def neo4j(self) -> Neo4jSettings:
+        """Neo4j database settings, resolved on first access."""
+        return Neo4jSettings(**self._overrides)
+
+
+@lru_cache(maxsize=1)
+def get_settings(**overrides: Any) -> SettingsWrapper:
+    """
+    Get the process-wide settings instance.
+
+    The .env file is parsed and validated once; subsequent calls with
+    the same overrides return the cached wrapper.
+
+    Args:
+        **overrides: Field values keyed by environment variable name
+                     (e.g. ``EXTRACTION_LIMIT=100``), taking precedence
+                     over the environment and .env file
+
+    Returns:
+        Settings wrapper
+    """
+    return SettingsWrapper(overrides=overrides)
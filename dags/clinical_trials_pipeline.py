@@ -9,10 +9,11 @@ Schedule: Daily at 2 AM UTC (adjust as needed)
 
 from datetime import datetime, timedelta
 from pathlib import Path
+import os
 import sys
 
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.decorators import task
 from airflow.operators.empty import EmptyOperator
 from airflow.utils.task_group import TaskGroup
 
@@ -20,6 +21,39 @@ from airflow.utils.task_group import TaskGroup
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from config.settings import get_settings
+from src.ingestion.aact_extractor import AACTExtractor
+from src.transformation import StagedTransformer
+from src.utils import get_logger, setup_logging
+
+# The Neo4j driver is only needed by the workers running the load/validate
+# tasks; keep the DAG parseable on schedulers that don't have it installed.
+try:
+    from neo4j import GraphDatabase
+    from src.loading import Neo4jLoader
+except ImportError:
+    GraphDatabase = None
+    Neo4jLoader = None
+
+
+def _require_neo4j() -> None:
+    """Fail the running task if the Neo4j driver isn't installed."""
+    if GraphDatabase is None:
+        raise ImportError("The neo4j package is required to run this task")
+
+
+# Airflow pools bounding concurrent connections to each database.
+# Create them once per deployment, e.g.:
+#   airflow pools set aact_pool 4 "AACT PostgreSQL connections"
+#   airflow pools set neo4j_pool 2 "Concurrent Neo4j load tasks"
+# A neo4j_pool slot is a whole load, which opens up to
+# Neo4jLoader.MAX_WORKERS + MAX_CONCURRENT_TRANSACTIONS sessions.
+AACT_POOL = "aact_pool"
+NEO4J_POOL = "neo4j_pool"
+
+# One mapped extraction task per AACT table
+EXTRACT_TABLES = list(AACTExtractor.TABLES_CONFIG)
+
 
 # Default DAG arguments
 default_args = {
@@ -29,46 +63,84 @@ default_args = {
     "email_on_retry": False,
     "retries": 2,
     "retry_delay": timedelta(minutes=5),
-    "execution_timeout": timedelta(hours=2),
 }
 
 
-def _extract_data(**context):
-    """Extract data from AACT database."""
-    from config.settings import get_settings
-    from src.ingestion.aact_extractor import AACTExtractor
-    from src.utils import get_logger, setup_logging
+# Settings and logger shared by every task run in this worker process
+_context = None
+
+
+def _ctx():
+    """Load settings and configure logging once per worker process."""
+    global _context
+    if _context is None:
+        settings = get_settings()
+        setup_logging(settings.log_level)
+        _context = (settings, get_logger(__name__))
+    return _context
+
+
+@task(pool=AACT_POOL, execution_timeout=timedelta(minutes=15))
+def select_studies():
+    """Select the NCT IDs of the studies to extract from AACT."""
+    settings, logger = _ctx()
     
-    settings = get_settings()
-    setup_logging(settings.log_level)
-    logger = get_logger(__name__)
+    logger.info("Starting AACT study selection task")
     
-    logger.info("Starting AACT extraction task")
+    with AACTExtractor(settings) as extractor:
+        if not extractor.test_connection():
+            raise ConnectionError("Cannot connect to AACT database")
+        
+        # Limit is read from settings internally
+        nct_ids = extractor.get_study_nct_ids()
+    
+    if not nct_ids:
+        logger.warning("No studies found matching criteria")
+    
+    # Returned via XCom to the mapped extraction tasks
+    return nct_ids
+
+
+@task(pool=AACT_POOL, execution_timeout=timedelta(hours=1))
+def extract_table(table_name, nct_ids):
+    """Extract a single AACT table for the selected studies."""
+    settings, logger = _ctx()
+    
+    logger.info("Starting AACT extraction task", table=table_name)
     
     # Ensure output directory exists
     settings.data.ensure_paths_exist()
     
-    # Initialize extractor with settings object
-    extractor = AACTExtractor(settings)
+    with AACTExtractor(settings) as extractor:
+        stats = extractor.extract_tables(nct_ids, tables=[table_name])
     
-    # Run extraction (limit is read from settings internally)
-    stats = extractor.extract_all()
+    logger.info("Extraction completed", table=table_name, **stats)
+    return stats
+
+
+@task(execution_timeout=timedelta(minutes=5))
+def record_extraction(nct_ids, table_stats):
+    """Combine per-table extraction stats and save extraction metadata."""
+    settings, logger = _ctx()
     
-    logger.info("Extraction completed", **stats)
+    stats = {
+        "studies_found": len(nct_ids),
+        "tables_extracted": sum(s["tables_extracted"] for s in table_stats),
+        "total_rows": sum(s["total_rows"] for s in table_stats),
+        "files": [f for s in table_stats for f in s["files"]],
+    }
+    
+    with AACTExtractor(settings) as extractor:
+        extractor.save_metadata(nct_ids, stats)
     
-    # Push stats to XCom for downstream tasks
+    logger.info("Extraction completed", **stats)
     return stats
 
 
-def _transform_data(**context):
+@task(execution_timeout=timedelta(minutes=30))
+def transform_to_staged(ti=None):
     """Transform raw data to staged format."""
-    from config.settings import get_settings
-    from src.transformation import StagedTransformer
-    from src.utils import get_logger, setup_logging
-    
-    settings = get_settings()
-    setup_logging(settings.log_level)
-    logger = get_logger(__name__)
+    settings, logger = _ctx()
     
     logger.info("Starting transformation task")
     
@@ -77,21 +149,32 @@ def _transform_data(**context):
         staged_path=settings.data.staged_path,
     )
     
+    # Skip the transformation when neither the raw data nor the transformation
+    # code changed since the last run and its staged files are all still there
+    cache_file = settings.data.staged_path / ".cache_key"
+    cache_key = transformer.cache_key()
+    if ti is not None and cache_file.exists() and cache_file.read_text() == cache_key:
+        prior_stats = ti.xcom_pull(task_ids=ti.task_id, include_prior_dates=True)
+        if prior_stats and prior_stats.get("files") and all(
+            Path(f).exists() for f in prior_stats["files"]
+        ):
+            logger.info("Raw data and code unchanged, reusing staged data", cache_key=cache_key)
+            return prior_stats
+        logger.info("Staged output of the last run is missing or incomplete, transforming again")
+    
     stats = transformer.transform_all()
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(cache_key)
     
     logger.info("Transformation completed", **stats)
     return stats
 
 
-def _load_to_neo4j(**context):
+@task(pool=NEO4J_POOL, execution_timeout=timedelta(hours=1))
+def load_to_neo4j():
     """Load staged data into Neo4j."""
-    from config.settings import get_settings
-    from src.loading import Neo4jLoader
-    from src.utils import get_logger, setup_logging
-    
-    settings = get_settings()
-    setup_logging(settings.log_level)
-    logger = get_logger(__name__)
+    _require_neo4j()
+    settings, logger = _ctx()
     
     logger.info("Starting Neo4j loading task")
     
@@ -110,15 +193,11 @@ def _load_to_neo4j(**context):
         loader.close()
 
 
-def _validate_graph(**context):
+@task(execution_timeout=timedelta(minutes=5))
+def validate_graph():
     """Validate loaded data in Neo4j."""
-    from config.settings import get_settings
-    from neo4j import GraphDatabase
-    from src.utils import get_logger, setup_logging
-    
-    settings = get_settings()
-    setup_logging(settings.log_level)
-    logger = get_logger(__name__)
+    _require_neo4j()
+    settings, logger = _ctx()
     
     logger.info("Starting graph validation task")
     
@@ -127,28 +206,27 @@ def _validate_graph(**context):
         auth=(settings.neo4j.user, settings.neo4j.password),
     )
     
-    validation_queries = {
-        "trial_count": "MATCH (t:Trial) RETURN count(t) AS count",
-        "org_count": "MATCH (o:Organization) RETURN count(o) AS count",
-        "drug_count": "MATCH (d:Drug) RETURN count(d) AS count",
-        "condition_count": "MATCH (c:Condition) RETURN count(c) AS count",
-        "sponsored_by_count": "MATCH ()-[r:SPONSORED_BY]->() RETURN count(r) AS count",
-        "investigates_count": "MATCH ()-[r:INVESTIGATES]->() RETURN count(r) AS count",
-        "targets_count": "MATCH ()-[r:TARGETS]->() RETURN count(r) AS count",
-    }
+    # Every count runs as a subquery of one statement: a single round-trip
+    validation_query = """
+    CALL { MATCH (t:Trial) RETURN count(t) AS trial_count }
+    CALL { MATCH (o:Organization) RETURN count(o) AS org_count }
+    CALL { MATCH (d:Drug) RETURN count(d) AS drug_count }
+    CALL { MATCH (c:Condition) RETURN count(c) AS condition_count }
+    CALL { MATCH ()-[r:SPONSORED_BY]->() RETURN count(r) AS sponsored_by_count }
+    CALL { MATCH ()-[r:INVESTIGATES]->() RETURN count(r) AS investigates_count }
+    CALL { MATCH ()-[r:TARGETS]->() RETURN count(r) AS targets_count }
+    RETURN *
+    """
     
-    results = {}
     try:
         with driver.session() as session:
-            for name, query in validation_queries.items():
-                result = session.run(query)
-                record = result.single()
-                results[name] = record["count"] if record else 0
+            record = session.run(validation_query).single()
+            results = dict(record) if record else {}
         
         logger.info("Validation completed", **results)
         
         # Basic validation checks
-        if results["trial_count"] == 0:
+        if not results.get("trial_count"):
             raise ValueError("No trials loaded - validation failed")
         
         return results
@@ -170,37 +248,23 @@ with DAG(
     # Start marker
     start = EmptyOperator(task_id="start")
     
-    # Extract data from AACT
+    # Extract data from AACT: select studies once, then one mapped task per table
     with TaskGroup(group_id="extraction") as extraction_group:
-        extract_task = PythonOperator(
-            task_id="extract_from_aact",
-            python_callable=_extract_data,
-            provide_context=True,
-        )
+        nct_ids = select_studies()
+        table_stats = extract_table.partial(nct_ids=nct_ids).expand(table_name=EXTRACT_TABLES)
+        record_extraction(nct_ids, table_stats)
     
-    # Transform data
+    # Transform data (needs every raw table, so waits for the whole extraction)
     with TaskGroup(group_id="transformation") as transformation_group:
-        transform_task = PythonOperator(
-            task_id="transform_to_staged",
-            python_callable=_transform_data,
-            provide_context=True,
-        )
+        transform_to_staged()
     
     # Load to Neo4j
     with TaskGroup(group_id="loading") as loading_group:
-        load_task = PythonOperator(
-            task_id="load_to_neo4j",
-            python_callable=_load_to_neo4j,
-            provide_context=True,
-        )
+        load_to_neo4j()
     
     # Validate
     with TaskGroup(group_id="validation") as validation_group:
-        validate_task = PythonOperator(
-            task_id="validate_graph",
-            python_callable=_validate_graph,
-            provide_context=True,
-        )
+        validate_graph()
     
     # End marker
     end = EmptyOperator(task_id="end")
@@ -209,16 +273,19 @@ with DAG(
     start >> extraction_group >> transformation_group >> loading_group >> validation_group >> end
 
 
-# For testing outside Airflow
-if __name__ == "__main__":
+# For testing outside Airflow: RUN_DAG_LOCAL=1 python dags/clinical_trials_pipeline.py
+# (guarded so executing the file directly, e.g. to validate it, never runs the pipeline)
+if __name__ == "__main__" and os.environ.get("RUN_DAG_LOCAL") == "1":
     print("Testing DAG tasks...")
     print("1. Extract...")
-    _extract_data()
+    settings, _ = _ctx()
+    settings.data.ensure_paths_exist()
+    with AACTExtractor(settings) as extractor:
+        extractor.extract_all()
     print("2. Transform...")
-    _transform_data()
+    transform_to_staged.function()
     print("3. Load...")
-    _load_to_neo4j()
+    load_to_neo4j.function()
     print("4. Validate...")
-    _validate_graph()
+    validate_graph.function()
     print("Done!")
-
@@ -8,66 +8,68 @@ Usage:
     python scripts/extract_data.py --tables studies,sponsors,interventions
 """
 
+import argparse
 import sys
 from pathlib import Path
-from typing import Optional
-
-import click
+from typing import List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import get_settings
-from src.ingestion import AACTExtractor
-from src.utils import get_logger, setup_logging
-
-
-@click.command()
-@click.option(
-    "--limit",
-    default=None,
-    type=int,
-    help="Limit number of studies to extract (overrides config)",
-)
-@click.option(
-    "--tables",
-    default=None,
-    type=str,
-    help="Comma-separated list of tables to extract",
-)
-@click.option(
-    "--output-dir",
-    default=None,
-    type=click.Path(path_type=Path),
-    help="Output directory for extracted data",
-)
-@click.option(
-    "--log-level",
-    default="INFO",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]),
-    help="Logging level",
-)
-def main(
-    limit: Optional[int],
-    tables: Optional[str],
-    output_dir: Optional[Path],
-    log_level: str,
-) -> None:
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Extract clinical trials data from AACT database.",
+    )
+    parser.add_argument(
+        "--limit",
+        default=None,
+        type=int,
+        help="Limit number of studies to extract (overrides config)",
+    )
+    parser.add_argument(
+        "--tables",
+        default=None,
+        type=str,
+        help="Comma-separated list of tables to extract",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        type=Path,
+        help="Output directory for extracted data",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Extract clinical trials data from AACT database."""
-    # Setup logging
-    setup_logging(log_level)
-    logger = get_logger(__name__)
+    args = parse_args(argv)
+    tables = args.tables
 
-    # Load settings
-    settings = get_settings()
+    # Imported after parsing so --help doesn't pay for pandas/SQLAlchemy
+    from config.settings import get_settings
+    from src.ingestion import AACTExtractor
+    from src.utils import get_logger, setup_logging
 
-    # Override settings if CLI args provided
-    if limit is not None:
-        settings.extraction.limit = limit
+    # Setup logging
+    setup_logging(args.log_level)
+    logger = get_logger(__name__)
 
-    if output_dir is not None:
-        settings.data.raw_path = output_dir
+    # Load settings, applying CLI overrides in a single validation
+    overrides = {
+        "EXTRACTION_LIMIT": args.limit,
+        "DATA_RAW_PATH": args.output_dir,
+    }
+    settings = get_settings(**{k: v for k, v in overrides.items() if v is not None})
 
     # Ensure output directory exists
     settings.data.ensure_paths_exist()
@@ -95,11 +97,9 @@ def main(
         sys.exit(1)
 
     try:
-        # Initialize extractor
-        extractor = AACTExtractor(settings)
-
         # Run extraction
-        stats = extractor.extract_all(tables=table_list)
+        with AACTExtractor(settings) as extractor:
+            stats = extractor.extract_all(tables=table_list)
 
         logger.info(
             "Extraction completed successfully",
@@ -6,66 +6,76 @@ Usage:
     python scripts/load_neo4j.py
 """
 
+import argparse
 import sys
 from pathlib import Path
-
-import click
+from typing import List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import get_settings
-from src.loading import Neo4jLoader
-from src.utils import get_logger, setup_logging
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load staged clinical trials data into Neo4j.",
+    )
+    parser.add_argument(
+        "--staged-dir",
+        default=None,
+        type=Path,
+        help="Staged data directory (overrides config)",
+    )
+    parser.add_argument(
+        "--neo4j-uri",
+        default=None,
+        help="Neo4j connection URI (overrides config)",
+    )
+    parser.add_argument(
+        "--neo4j-user",
+        default=None,
+        help="Neo4j username (overrides config)",
+    )
+    parser.add_argument(
+        "--neo4j-password",
+        default=None,
+        help="Neo4j password (overrides config)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    return parser.parse_args(argv)
 
 
-@click.command()
-@click.option(
-    "--staged-dir",
-    default=None,
-    type=click.Path(path_type=Path),
-    help="Staged data directory (overrides config)",
-)
-@click.option(
-    "--neo4j-uri",
-    default=None,
-    help="Neo4j connection URI (overrides config)",
-)
-@click.option(
-    "--neo4j-user",
-    default=None,
-    help="Neo4j username (overrides config)",
-)
-@click.option(
-    "--neo4j-password",
-    default=None,
-    help="Neo4j password (overrides config)",
-)
-@click.option(
-    "--log-level",
-    default="INFO",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]),
-    help="Logging level",
-)
-def main(
-    staged_dir: Path,
-    neo4j_uri: str,
-    neo4j_user: str,
-    neo4j_password: str,
-    log_level: str,
-) -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Load staged clinical trials data into Neo4j."""
-    setup_logging(log_level)
+    args = parse_args(argv)
+    
+    # Imported after parsing so --help doesn't pay for pandas/neo4j
+    from config.settings import get_settings
+    from src.loading import Neo4jLoader
+    from src.utils import get_logger, setup_logging
+    
+    setup_logging(args.log_level)
     logger = get_logger(__name__)
     
-    settings = get_settings()
+    # Load settings, applying CLI overrides in a single validation
+    overrides = {
+        "DATA_STAGED_PATH": args.staged_dir,
+        "NEO4J_URI": args.neo4j_uri,
+        "NEO4J_USER": args.neo4j_user,
+        "NEO4J_PASSWORD": args.neo4j_password,
+    }
+    settings = get_settings(**{k: v for k, v in overrides.items() if v is not None})
     
-    # Use CLI args or config
-    staged_path = staged_dir or settings.data.staged_path
-    uri = neo4j_uri or settings.neo4j.uri
-    user = neo4j_user or settings.neo4j.user
-    password = neo4j_password or settings.neo4j.password
+    staged_path = settings.data.staged_path
+    uri = settings.neo4j.uri
+    user = settings.neo4j.user
+    password = settings.neo4j.password
     
     logger.info(
         "Starting Neo4j loading",
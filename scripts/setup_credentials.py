@@ -9,10 +9,38 @@ Usage:
     python scripts/setup_credentials.py
 """
 
+import io
 import os
+import re
 import sys
 from pathlib import Path
 
+# Used when .env.example is missing
+DEFAULT_TEMPLATE = """# AACT Database Connection
+AACT_HOST=aact-db.ctti-clinicaltrials.org
+AACT_PORT=5432
+AACT_DATABASE=aact
+AACT_USER=your_username
+AACT_PASSWORD=your_password
+
+# Neo4j Connection
+NEO4J_URI=bolt://localhost:7687
+NEO4J_USER=neo4j
+NEO4J_PASSWORD=password
+
+# Data paths
+DATA_RAW_PATH=./data/raw
+DATA_STAGED_PATH=./data/staged
+DATA_GRAPH_PATH=./data/graph
+
+# Extraction settings
+EXTRACTION_LIMIT=1000
+
+# Logging
+LOG_LEVEL=INFO
+"""
+
+
 def main():
     """Set up AACT credentials interactively."""
     print("=" * 60)
@@ -38,35 +66,6 @@ def main():
             print("Keeping existing .env file")
             return
     
-    # Read the example file
-    if env_example.exists():
-        with open(env_example, 'r') as f:
-            content = f.read()
-    else:
-        content = """# AACT Database Connection
-AACT_HOST=aact-db.ctti-clinicaltrials.org
-AACT_PORT=5432
-AACT_DATABASE=aact
-AACT_USER=your_username
-AACT_PASSWORD=your_password
-
-# Neo4j Connection
-NEO4J_URI=bolt://localhost:7687
-NEO4J_USER=neo4j
-NEO4J_PASSWORD=password
-
-# Data paths
-DATA_RAW_PATH=./data/raw
-DATA_STAGED_PATH=./data/staged
-DATA_GRAPH_PATH=./data/graph
-
-# Extraction settings
-EXTRACTION_LIMIT=1000
-
-# Logging
-LOG_LEVEL=INFO
-"""
-    
     # Get credentials from user
     print("-" * 40)
     username = input("Enter AACT username: ").strip()
@@ -76,13 +75,18 @@ LOG_LEVEL=INFO
         print("Error: Username and password are required")
         sys.exit(1)
     
-    # Replace placeholders
-    content = content.replace("your_username", username)
-    content = content.replace("your_password", password)
+    # Stream the template into .env, replacing placeholders in a single pass
+    replacements = {"your_username": username, "your_password": password}
+    placeholder = re.compile("|".join(replacements))
+    
+    if env_example.exists():
+        template = open(env_example, 'r')
+    else:
+        template = io.StringIO(DEFAULT_TEMPLATE)
     
-    # Write .env file
-    with open(env_file, 'w') as f:
-        f.write(content)
+    with template, open(env_file, 'w') as f:
+        for line in template:
+            f.write(placeholder.sub(lambda m: replacements[m.group(0)], line))
     
     print()
     print(f"✓ Created .env file at: {env_file}")
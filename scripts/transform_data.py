@@ -6,53 +6,63 @@ Usage:
     python scripts/transform_data.py
 """
 
+import argparse
 import sys
 from pathlib import Path
-
-import click
+from typing import List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import get_settings
-from src.transformation import StagedTransformer
-from src.utils import get_logger, setup_logging
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Transform raw clinical trials data to staged format.",
+    )
+    parser.add_argument(
+        "--raw-dir",
+        default=None,
+        type=Path,
+        help="Raw data directory (overrides config)",
+    )
+    parser.add_argument(
+        "--staged-dir",
+        default=None,
+        type=Path,
+        help="Staged data directory (overrides config)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    return parser.parse_args(argv)
 
 
-@click.command()
-@click.option(
-    "--raw-dir",
-    default=None,
-    type=click.Path(path_type=Path),
-    help="Raw data directory (overrides config)",
-)
-@click.option(
-    "--staged-dir",
-    default=None,
-    type=click.Path(path_type=Path),
-    help="Staged data directory (overrides config)",
-)
-@click.option(
-    "--log-level",
-    default="INFO",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]),
-    help="Logging level",
-)
-def main(
-    raw_dir: Path,
-    staged_dir: Path,
-    log_level: str,
-) -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Transform raw clinical trials data to staged format."""
-    setup_logging(log_level)
+    args = parse_args(argv)
+    
+    # Imported after parsing so --help doesn't pay for pandas
+    from config.settings import get_settings
+    from src.transformation import StagedTransformer
+    from src.utils import get_logger, setup_logging
+    
+    setup_logging(args.log_level)
     logger = get_logger(__name__)
     
-    settings = get_settings()
+    # Load settings, applying CLI overrides in a single validation
+    overrides = {
+        "DATA_RAW_PATH": args.raw_dir,
+        "DATA_STAGED_PATH": args.staged_dir,
+    }
+    settings = get_settings(**{k: v for k, v in overrides.items() if v is not None})
     
-    # Use CLI args or config
-    raw_path = raw_dir or settings.data.raw_path
-    staged_path = staged_dir or settings.data.staged_path
+    raw_path = settings.data.raw_path
+    staged_path = settings.data.staged_path
     
     logger.info(
         "Starting data transformation",
@@ -5,11 +5,19 @@ Extracts clinical trial data from the AACT PostgreSQL database
 and saves it as Parquet files for further processing.
 """
 
+import io
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
@@ -26,7 +34,8 @@ class AACTExtractor:
     structured access to clinical trial information.
     """
 
-    # Tables to extract with their key columns (based on actual AACT schema)
+    # Tables to extract with their key columns (based on actual AACT schema).
+    # "categorical" lists low-cardinality columns stored dictionary-encoded.
     TABLES_CONFIG = {
         "studies": {
             "description": "Core study information",
@@ -56,6 +65,16 @@ class AACTExtractor:
                 "why_stopped",
                 "has_dmc",
             ],
+            "categorical": [
+                "overall_status",
+                "last_known_status",
+                "phase",
+                "study_type",
+                "enrollment_type",
+                "start_date_type",
+                "completion_date_type",
+                "source_class",
+            ],
         },
         "sponsors": {
             "description": "Sponsor and collaborator organizations",
@@ -66,6 +85,10 @@ class AACTExtractor:
                 "lead_or_collaborator",
                 "name",
             ],
+            "categorical": [
+                "agency_class",
+                "lead_or_collaborator",
+            ],
         },
         "interventions": {
             "description": "Study interventions (drugs, biologics, etc.)",
@@ -76,6 +99,9 @@ class AACTExtractor:
                 "name",
                 "description",
             ],
+            "categorical": [
+                "intervention_type",
+            ],
         },
         "intervention_other_names": {
             "description": "Alternative names for interventions",
@@ -97,6 +123,9 @@ class AACTExtractor:
                 "population",
                 "description",
             ],
+            "categorical": [
+                "outcome_type",
+            ],
         },
         "eligibilities": {
             "description": "Eligibility criteria",
@@ -112,6 +141,9 @@ class AACTExtractor:
                 "older_adult",
                 "criteria",
             ],
+            "categorical": [
+                "gender",
+            ],
         },
         "conditions": {
             "description": "Conditions/diseases being studied",
@@ -131,6 +163,9 @@ class AACTExtractor:
                 "downcase_mesh_term",
                 "mesh_type",
             ],
+            "categorical": [
+                "mesh_type",
+            ],
         },
         "design_groups": {
             "description": "Treatment arm/group descriptions",
@@ -141,6 +176,9 @@ class AACTExtractor:
                 "title",
                 "description",
             ],
+            "categorical": [
+                "group_type",
+            ],
         },
         "facilities": {
             "description": "Study locations/sites",
@@ -154,6 +192,10 @@ class AACTExtractor:
                 "country",
                 "status",
             ],
+            "categorical": [
+                "country",
+                "status",
+            ],
         },
         "responsible_parties": {
             "description": "Responsible party information",
@@ -166,18 +208,68 @@ class AACTExtractor:
                 "organization",
                 "affiliation",
             ],
+            "categorical": [
+                "responsible_party_type",
+            ],
         },
     }
 
-    def __init__(self, settings: Any) -> None:
+    # Rows fetched per round-trip when streaming query results
+    FETCH_SIZE = 10_000
+
+    # Tables extracted concurrently, each worker on its own connection.
+    # Kept small so a run never holds many connections to the shared AACT server.
+    MAX_WORKERS = 4
+
+    # Raw Parquet settings: ZSTD with dictionary encoding keeps files small;
+    # per row group statistics let readers skip row groups when filtering
+    # (e.g. on nct_id)
+    PARQUET_OPTIONS = {
+        "compression": "zstd",
+        "use_dictionary": True,
+        "data_page_size": 1 << 20,
+        "write_statistics": True,
+    }
+    ROW_GROUP_SIZE = 128_000
+
+    # COPY output held in memory up to this size before spilling to disk,
+    # and bytes of it decoded per record batch when streaming to Parquet
+    COPY_SPOOL_SIZE = 64 << 20
+    CSV_BLOCK_SIZE = 16 << 20
+
+    # Text columns such as eligibility criteria contain newlines
+    CSV_PARSE_OPTIONS = pa_csv.ParseOptions(newlines_in_values=True)
+
+    # Arrow types for the PostgreSQL column types found in AACT tables.
+    # Anything not listed here (text, character varying, ...) is read as string.
+    ARROW_TYPES = {
+        "smallint": pa.int64(),
+        "integer": pa.int64(),
+        "bigint": pa.int64(),
+        "numeric": pa.float64(),
+        "real": pa.float64(),
+        "double precision": pa.float64(),
+        "boolean": pa.bool_(),
+        "date": pa.date32(),
+        "timestamp without time zone": pa.timestamp("us"),
+    }
+
+    def __init__(self, settings: Any, engine: Optional[Engine] = None) -> None:
         """
         Initialize the AACT extractor.
 
         Args:
             settings: Application settings containing database credentials
+            engine: Optional existing engine whose connection pool should be
+                    shared. Extractors never dispose an engine they were given.
         """
         self.settings = settings
-        self._engine: Optional[Engine] = None
+        self._engine: Optional[Engine] = engine
+        self._owns_engine = engine is None
+
+        # information_schema lookups are stable within a run
+        self._schema_cache: Dict[str, pd.DataFrame] = {}
+        self._tables_cache: Optional[pd.DataFrame] = None
 
     @property
     def engine(self) -> Engine:
@@ -190,6 +282,11 @@ class AACTExtractor:
                 pool_pre_ping=True,
                 pool_size=5,
                 max_overflow=10,
+                # Fold executemany() calls into multi-row statements / page
+                # batches instead of one round-trip per row
+                executemany_mode="values_plus_batch",
+                insertmanyvalues_page_size=5000,
+                executemany_batch_page_size=500,
             )
         return self._engine
 
@@ -253,87 +350,197 @@ class AACTExtractor:
             limit=limit,
         )
 
+        # Stream the IDs through a server-side cursor instead of buffering
+        # the whole result client-side
         with self.engine.connect() as conn:
-            result = conn.execute(text(query), params)
-            nct_ids = [row[0] for row in result.fetchall()]
+            result = conn.execution_options(yield_per=self.FETCH_SIZE).execute(text(query), params)
+            nct_ids = list(result.scalars())
 
         logger.info("Found studies matching criteria", count=len(nct_ids))
         return nct_ids
 
-    def extract_table(
+    def extract_to_parquet(
         self,
         table_name: str,
         nct_ids: List[str],
-    ) -> pd.DataFrame:
+        output_dir: Path,
+        connection: Optional[Any] = None,
+    ) -> Tuple[int, Optional[Path]]:
         """
-        Extract a single table filtered by NCT IDs.
+        Extract a single table filtered by NCT IDs straight to Parquet.
+
+        The COPY output is decoded one block at a time and written as
+        contiguous row groups of ROW_GROUP_SIZE rows, so at most a row
+        group plus one block of rows is held in memory.
 
         Args:
             table_name: Name of the table to extract
             nct_ids: List of NCT IDs to filter by
+            output_dir: Directory to save to
+            connection: Optional connection from nct_filter_connection
 
         Returns:
-            DataFrame with extracted data
+            Number of rows extracted and path to the saved file
+            (None if the table has no rows for these studies)
         """
         if table_name not in self.TABLES_CONFIG:
             raise ValueError(f"Unknown table: {table_name}")
 
-        config = self.TABLES_CONFIG[table_name]
-        columns = config["columns"]
-        columns_str = ", ".join(columns)
+        if connection is None:
+            with self.nct_filter_connection(nct_ids) as connection:
+                return self.extract_to_parquet(table_name, nct_ids, output_dir, connection)
+
+        filepath = self._output_path(table_name, output_dir)
+        writer = None
+        rows = 0
+
+        # Decoded blocks waiting to fill a row group
+        pending: List[pa.RecordBatch] = []
+        pending_rows = 0
+
+        def write_row_group(table: pa.Table) -> None:
+            nonlocal writer
+            if writer is None:
+                writer = pq.ParquetWriter(filepath, table.schema, **self.PARQUET_OPTIONS)
+            # Blocks arrive as small chunks; write each row group from
+            # contiguous columns
+            writer.write_table(table.combine_chunks(), row_group_size=self.ROW_GROUP_SIZE)
+
+        with self._copy_table(table_name, connection) as copy_file:
+            reader = pa_csv.open_csv(
+                copy_file,
+                read_options=pa_csv.ReadOptions(block_size=self.CSV_BLOCK_SIZE),
+                parse_options=self.CSV_PARSE_OPTIONS,
+                convert_options=self._csv_convert_options(table_name),
+            )
+            try:
+                for batch in reader:
+                    if not batch.num_rows:
+                        continue
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    rows += batch.num_rows
+                    while pending_rows >= self.ROW_GROUP_SIZE:
+                        buffered = pa.Table.from_batches(pending, schema=reader.schema)
+                        write_row_group(buffered.slice(0, self.ROW_GROUP_SIZE))
+                        rest = buffered.slice(self.ROW_GROUP_SIZE)
+                        pending, pending_rows = rest.to_batches(), rest.num_rows
+                if pending_rows:
+                    write_row_group(pa.Table.from_batches(pending, schema=reader.schema))
+            except Exception:
+                # Never leave a partial file behind to be picked up as the latest
+                if writer is not None:
+                    writer.close()
+                    filepath.unlink(missing_ok=True)
+                raise
 
-        # Use ANY for efficient filtering with large lists
-        query = f"""
-        SELECT {columns_str}
-        FROM ctgov.{table_name}
-        WHERE nct_id = ANY(:nct_ids)
+        if writer is None:
+            return 0, None
+        writer.close()
+
+        logger.info(f"Extracted {table_name}", rows=rows, file=str(filepath))
+        return rows, filepath
+
+    @contextmanager
+    def _copy_table(self, table_name: str, connection: Any) -> Iterator[IO[bytes]]:
+        """
+        Run a table's filtered SELECT through COPY into a spooled file.
+
+        Streaming the result through a server-side COPY avoids fetching rows
+        as Python tuples; pyarrow then parses the CSV into columns.
+
+        Args:
+            table_name: Name of the table to extract
+            connection: Connection from nct_filter_connection
+
+        Yields:
+            Binary file positioned at the start of the CSV output
         """
+        columns = self.TABLES_CONFIG[table_name]["columns"]
+        columns_str = ", ".join(columns)
 
         logger.debug(f"Extracting table: {table_name}", columns=columns)
 
-        with self.engine.connect() as conn:
-            df = pd.read_sql(
-                text(query),
-                conn,
-                params={"nct_ids": nct_ids},
-            )
+        query = f"SELECT {columns_str} FROM ctgov.{table_name} JOIN nct_filter USING (nct_id)"
+        with tempfile.SpooledTemporaryFile(max_size=self.COPY_SPOOL_SIZE) as copy_file:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT CSV, HEADER)", copy_file)
+            copy_file.seek(0)
+            yield copy_file
 
-        logger.info(
-            f"Extracted {table_name}",
-            rows=len(df),
-            columns=list(df.columns),
-        )
+    @contextmanager
+    def nct_filter_connection(self, nct_ids: List[str]) -> Iterator[Any]:
+        """
+        Open a raw connection holding the NCT IDs in a temporary table.
 
-        return df
+        The IDs are uploaded once with COPY into nct_filter, which table
+        queries join against instead of binding the full ID list as an
+        array parameter each time. The table is dropped when the
+        connection's transaction ends.
 
-    def save_parquet(
-        self,
-        df: pd.DataFrame,
-        table_name: str,
-        output_dir: Path,
-    ) -> Path:
+        Args:
+            nct_ids: NCT IDs to filter by
+
+        Yields:
+            DBAPI connection with the nct_filter table populated
         """
-        Save DataFrame as Parquet file.
+        raw_conn = self.engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cursor:
+                cursor.execute(
+                    "CREATE TEMP TABLE nct_filter (nct_id text PRIMARY KEY) ON COMMIT DROP"
+                )
+                cursor.copy_expert(
+                    "COPY nct_filter FROM STDIN",
+                    io.StringIO("\n".join(dict.fromkeys(nct_ids))),
+                )
+                cursor.execute("ANALYZE nct_filter")
+            yield raw_conn
+        finally:
+            raw_conn.close()
+
+    def _csv_convert_options(self, table_name: str) -> pa_csv.ConvertOptions:
+        """
+        Build CSV conversion options matching a table's column types.
+
+        Column types come from the database schema so that values are never
+        re-inferred from text (e.g. zip codes stay strings).
 
         Args:
-            df: DataFrame to save
-            table_name: Name for the output file
-            output_dir: Directory to save to
+            table_name: Name of the table being extracted
 
         Returns:
-            Path to saved file
+            ConvertOptions for parsing the table's COPY output
         """
+        schema = self.get_table_schema(table_name)
+        db_types = dict(zip(schema["column_name"], schema["data_type"]))
+
+        column_types = {
+            column: self.ARROW_TYPES.get(db_types.get(column), pa.string())
+            for column in self.TABLES_CONFIG[table_name]["columns"]
+        }
+
+        # Low-cardinality columns are decoded straight into dictionary arrays
+        for column in self.TABLES_CONFIG[table_name].get("categorical", []):
+            column_types[column] = pa.dictionary(pa.int32(), pa.string())
+
+        # COPY writes NULL as an unquoted empty field and empty strings as ""
+        return pa_csv.ConvertOptions(
+            column_types=column_types,
+            null_values=[""],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+            true_values=["t"],
+            false_values=["f"],
+        )
+
+    def _output_path(self, table_name: str, output_dir: Path) -> Path:
+        """Build a timestamped Parquet path, creating the directory."""
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Add extraction timestamp to filename for versioning
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{table_name}_{timestamp}.parquet"
-        filepath = output_dir / filename
-
-        df.to_parquet(filepath, index=False, compression="snappy")
-
-        logger.debug(f"Saved {table_name} to {filepath}", rows=len(df))
-        return filepath
+        return output_dir / f"{table_name}_{timestamp}.parquet"
 
     def extract_all(
         self,
@@ -360,6 +567,27 @@ class AACTExtractor:
             logger.warning("No studies found matching criteria")
             return {"studies_found": 0, "tables_extracted": 0}
 
+        stats = self.extract_tables(nct_ids, tables)
+        self.save_metadata(nct_ids, stats)
+
+        return stats
+
+    def extract_tables(
+        self,
+        nct_ids: List[str],
+        tables: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract and save tables for an already selected set of studies.
+
+        Args:
+            nct_ids: NCT IDs to filter by (see get_study_nct_ids)
+            tables: Optional list of specific tables to extract.
+                   If None, extracts all configured tables.
+
+        Returns:
+            Dictionary with extraction statistics
+        """
         # Determine which tables to extract
         tables_to_extract = tables or list(self.TABLES_CONFIG.keys())
 
@@ -376,24 +604,77 @@ class AACTExtractor:
             "files": [],
         }
 
+        # Spread the tables over a few workers; each worker uploads the IDs
+        # once on its own connection and extracts its tables in turn
+        n_workers = min(self.MAX_WORKERS, len(tables_to_extract))
+        groups = [tables_to_extract[i::n_workers] for i in range(n_workers)]
+
+        results: Dict[str, Tuple[int, Optional[Path]]] = {}
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(self._extract_group, group, nct_ids, output_dir)
+                for group in groups
+            ]
+            for future in futures:
+                results.update(future.result())
+
         for table_name in tables_to_extract:
-            try:
-                logger.info(f"Extracting {table_name}...")
-                df = self.extract_table(table_name, nct_ids)
-
-                if not df.empty:
-                    filepath = self.save_parquet(df, table_name, output_dir)
-                    stats["files"].append(str(filepath))
-                    stats["total_rows"] += len(df)
-                    stats["tables_extracted"] += 1
-                else:
-                    logger.warning(f"No data found for {table_name}")
-
-            except Exception as e:
-                logger.error(f"Failed to extract {table_name}", error=str(e))
-                raise
+            rows, filepath = results[table_name]
+            if filepath is not None:
+                stats["files"].append(str(filepath))
+                stats["total_rows"] += rows
+                stats["tables_extracted"] += 1
+
+        return stats
 
-        # Save extraction metadata
+    def _extract_group(
+        self,
+        tables: List[str],
+        nct_ids: List[str],
+        output_dir: Path,
+    ) -> Dict[str, Tuple[int, Optional[Path]]]:
+        """
+        Extract and save a group of tables over a single connection.
+
+        Args:
+            tables: Tables to extract
+            nct_ids: NCT IDs to filter by
+            output_dir: Directory to save to
+
+        Returns:
+            Mapping of table name to (row count, saved file or None if empty)
+        """
+        results = {}
+
+        with self.nct_filter_connection(nct_ids) as connection:
+            for table_name in tables:
+                try:
+                    logger.info(f"Extracting {table_name}...")
+                    rows, filepath = self.extract_to_parquet(
+                        table_name, nct_ids, output_dir, connection
+                    )
+
+                    if filepath is None:
+                        logger.warning(f"No data found for {table_name}")
+                    results[table_name] = (rows, filepath)
+
+                except Exception as e:
+                    logger.error(f"Failed to extract {table_name}", error=str(e))
+                    raise
+
+        return results
+
+    def save_metadata(self, nct_ids: List[str], stats: Dict[str, Any]) -> Path:
+        """
+        Save extraction metadata alongside the raw files.
+
+        Args:
+            nct_ids: NCT IDs that were extracted
+            stats: Extraction statistics
+
+        Returns:
+            Path to saved file
+        """
         metadata = {
             "extraction_time": datetime.now().isoformat(),
             "nct_ids_count": len(nct_ids),
@@ -406,10 +687,16 @@ class AACTExtractor:
             "stats": stats,
         }
 
-        metadata_df = pd.DataFrame([metadata])
-        self.save_parquet(metadata_df, "_extraction_metadata", output_dir)
+        output_dir = self.settings.data.raw_path
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-        return stats
+        # Nested dicts/lists: a small JSON file, not a one-row Parquet table
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = output_dir / f"_extraction_metadata_{timestamp}.json"
+        filepath.write_text(json.dumps(metadata, indent=2, default=str))
+
+        logger.debug(f"Saved extraction metadata to {filepath}")
+        return filepath
 
     def get_table_schema(self, table_name: str) -> pd.DataFrame:
         """
@@ -421,6 +708,12 @@ class AACTExtractor:
         Returns:
             DataFrame with column information
         """
+        if table_name not in self._schema_cache:
+            self._schema_cache[table_name] = self._fetch_table_schema(table_name)
+        return self._schema_cache[table_name].copy()
+
+    def _fetch_table_schema(self, table_name: str) -> pd.DataFrame:
+        """Query information_schema for a table's columns."""
         query = """
         SELECT column_name, data_type, is_nullable
         FROM information_schema.columns
@@ -441,6 +734,13 @@ class AACTExtractor:
         Returns:
             DataFrame with table names and row counts
         """
+        if self._tables_cache is None:
+            self._tables_cache = self._fetch_available_tables()
+            logger.info("Found tables in AACT", count=len(self._tables_cache))
+        return self._tables_cache.copy()
+
+    def _fetch_available_tables(self) -> pd.DataFrame:
+        """Query information_schema for the tables in the ctgov schema."""
         query = """
         SELECT 
             table_name,
@@ -454,13 +754,18 @@ class AACTExtractor:
         with self.engine.connect() as conn:
             df = pd.read_sql(text(query), conn)
 
-        logger.info("Found tables in AACT", count=len(df))
         return df
 
     def close(self) -> None:
         """Close database connections."""
-        if self._engine:
+        if self._engine and self._owns_engine:
             self._engine.dispose()
             self._engine = None
             logger.debug("Database connections closed")
 
+    def __enter__(self) -> "AACTExtractor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
@@ -4,17 +4,25 @@ Neo4j graph database loader.
 Loads staged data into Neo4j using MERGE for idempotency.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import glob
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+import asyncio
+import os
+import re
+import threading
 
 import pandas as pd
-from neo4j import GraphDatabase, Driver
+import pyarrow.parquet as pq
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver
+from neo4j.exceptions import ClientError, TransientError
 
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 
 class Neo4jLoader:
     """
@@ -24,7 +32,31 @@ class Neo4jLoader:
     Supports batch processing for large datasets.
     """
     
-    BATCH_SIZE = 500
+    BATCH_SIZE = 5000
+    
+    # UNWIND batches committed together in one write transaction
+    BATCHES_PER_TRANSACTION = 4
+    
+    # Write transactions kept in flight at once by _batch_execute, across
+    # all concurrent loads (also the async driver's connection pool size)
+    MAX_CONCURRENT_TRANSACTIONS = 8
+    
+    # Rows uploaded per apoc.periodic.iterate call (keeps Bolt messages bounded)
+    # and rows per server-side transaction within it
+    APOC_CHUNK_SIZE = 100_000
+    APOC_BATCH_SIZE = 10_000
+    
+    # Retries per failed batch, e.g. on deadlocks between concurrent loads
+    APOC_RETRIES = 3
+    
+    # Rows sent per CALL { ... } IN TRANSACTIONS statement and rows per
+    # inner transaction, plus attempts at a statement that hit a deadlock
+    IN_TRANSACTIONS_CHUNK_SIZE = 20_000
+    IN_TRANSACTIONS_ROWS = 1000
+    IN_TRANSACTIONS_RETRIES = 3
+    
+    # Loads run concurrently by load_all
+    MAX_WORKERS = 4
     
     def __init__(
         self,
@@ -47,6 +79,15 @@ class Neo4jLoader:
         self.password = password
         self.staged_path = Path(staged_path)
         self._driver: Optional[Driver] = None
+        self._has_apoc: Optional[bool] = None
+        
+        # Event loop thread, async driver and write slots shared by every
+        # _batch_execute call; created on first use, released by close()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._async_driver: Optional[AsyncDriver] = None
+        self._write_slots: Optional[asyncio.Semaphore] = None
     
     @property
     def driver(self) -> Driver:
@@ -70,16 +111,53 @@ class Neo4jLoader:
             logger.error("Neo4j connection failed", error=str(e))
             return False
     
+    @property
+    def has_apoc(self) -> bool:
+        """Whether the APOC procedures are installed on the server."""
+        if self._has_apoc is None:
+            try:
+                with self.driver.session() as session:
+                    session.run("RETURN apoc.version() AS version").consume()
+                self._has_apoc = True
+            except ClientError:
+                logger.info("APOC not available, loading with client-side batches")
+                self._has_apoc = False
+        return self._has_apoc
+    
     def _get_latest_file(self, pattern: str) -> Optional[Path]:
         """Get the most recent file matching pattern."""
-        files = sorted(glob.glob(str(self.staged_path / f"{pattern}_*.parquet")))
-        return Path(files[-1]) if files else None
+        if not self.staged_path.is_dir():
+            return None
+        
+        # Timestamped names sort chronologically, so the latest is the max name
+        prefix = f"{pattern}_"
+        latest = None
+        with os.scandir(self.staged_path) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith(".parquet"):
+                    if latest is None or entry.name > latest.name:
+                        latest = entry
+        return Path(latest.path) if latest else None
     
-    def _load_staged(self, table_name: str) -> Optional[pd.DataFrame]:
-        """Load staged data for a table."""
+    def _load_staged(
+        self,
+        table_name: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load staged data for a table.
+        
+        Args:
+            table_name: Name of the staged table
+            columns: Columns to read; None reads every column
+            
+        Returns:
+            DataFrame with the staged data, or None if there is none
+        """
         filepath = self._get_latest_file(table_name)
         if filepath and filepath.exists():
-            return pd.read_parquet(filepath)
+            # Memory-map the file and decode only the projected columns
+            return pq.read_table(filepath, columns=columns, memory_map=True).to_pandas()
         logger.warning(f"No staged data found for {table_name}")
         return None
     
@@ -120,6 +198,9 @@ class Neo4jLoader:
                     logger.debug(f"Created index: {index[:50]}...")
                 except Exception as e:
                     logger.debug(f"Index may already exist: {e}")
+            
+            # Wait for the indexes to come online so MERGE uses them from the first batch
+            session.run("CALL db.awaitIndexes()").consume()
         
         logger.info("Created constraints and indexes")
     
@@ -130,29 +211,41 @@ class Neo4jLoader:
         Returns:
             Number of nodes created/updated
         """
-        df = self._load_staged("studies")
+        df = self._load_staged("studies", columns=[
+            'nct_id', 'brief_title', 'official_title', 'phase', 'phase_clean',
+            'overall_status', 'status_category', 'study_type', 'enrollment',
+            'start_date', 'completion_date', 'is_fda_regulated_drug', 'number_of_arms',
+        ])
         if df is None or df.empty:
             return 0
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MERGE (t:Trial {nct_id: row.nct_id})
-        SET t.brief_title = row.brief_title,
-            t.official_title = row.official_title,
-            t.phase = row.phase,
-            t.phase_clean = row.phase_clean,
-            t.overall_status = row.overall_status,
-            t.status_category = row.status_category,
-            t.study_type = row.study_type,
-            t.enrollment = row.enrollment,
-            t.start_date = row.start_date,
-            t.completion_date = row.completion_date,
-            t.is_fda_regulated_drug = row.is_fda_regulated_drug,
-            t.number_of_arms = row.number_of_arms,
-            t.updated_at = datetime()
+        WITH t, now, {
+            brief_title: row.brief_title,
+            official_title: row.official_title,
+            phase: row.phase,
+            phase_clean: row.phase_clean,
+            overall_status: row.overall_status,
+            status_category: row.status_category,
+            study_type: row.study_type,
+            enrollment: row.enrollment,
+            start_date: row.start_date,
+            completion_date: row.completion_date,
+            is_fda_regulated_drug: row.is_fda_regulated_drug,
+            number_of_arms: row.number_of_arms
+        } AS props
+        WHERE t.updated_at IS NULL OR any(
+            key IN keys(props)
+            WHERE coalesce(t[key] <> props[key], t[key] IS NOT NULL OR props[key] IS NOT NULL)
+        )
+        SET t += props,
+            t.updated_at = now
         """
         
-        count = self._batch_execute(query, df)
+        count = self._iterate_execute(query, df)
         logger.info("Loaded Trial nodes", count=count)
         return count
     
@@ -163,17 +256,27 @@ class Neo4jLoader:
         Returns:
             Number of nodes created/updated
         """
-        df = self._load_staged("organizations")
+        df = self._load_staged("organizations", columns=[
+            'org_key', 'org_name', 'org_name_original', 'agency_class',
+        ])
         if df is None or df.empty:
             return 0
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MERGE (o:Organization {org_key: row.org_key})
-        SET o.name = row.org_name,
-            o.name_original = row.org_name_original,
-            o.agency_class = row.agency_class,
-            o.updated_at = datetime()
+        WITH o, now, {
+            name: row.org_name,
+            name_original: row.org_name_original,
+            agency_class: row.agency_class
+        } AS props
+        WHERE o.updated_at IS NULL OR any(
+            key IN keys(props)
+            WHERE coalesce(o[key] <> props[key], o[key] IS NOT NULL OR props[key] IS NOT NULL)
+        )
+        SET o += props,
+            o.updated_at = now
         """
         
         count = self._batch_execute(query, df)
@@ -187,27 +290,33 @@ class Neo4jLoader:
         Returns:
             Number of nodes created/updated
         """
-        df = self._load_staged("drugs")
+        df = self._load_staged("drugs", columns=[
+            'drug_key', 'drug_name', 'drug_name_original', 'intervention_type',
+        ])
         if df is None or df.empty:
             return 0
         
-        # Get unique drugs by drug_key
-        unique_drugs = df.groupby('drug_key').agg({
-            'drug_name': 'first',
-            'drug_name_original': 'first',
-            'intervention_type': 'first',
-        }).reset_index()
+        # Get unique drugs by drug_key (rows without a key cannot be merged)
+        unique_drugs = df.dropna(subset=['drug_key']).drop_duplicates(subset=['drug_key'])
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MERGE (d:Drug {drug_key: row.drug_key})
-        SET d.name = row.drug_name,
-            d.name_original = row.drug_name_original,
-            d.intervention_type = row.intervention_type,
-            d.updated_at = datetime()
+        WITH d, now, {
+            name: row.drug_name,
+            name_original: row.drug_name_original,
+            intervention_type: row.intervention_type
+        } AS props
+        WHERE d.updated_at IS NULL OR any(
+            key IN keys(props)
+            WHERE coalesce(d[key] <> props[key], d[key] IS NOT NULL OR props[key] IS NOT NULL)
+        )
+        SET d += props,
+            d.updated_at = now
         """
         
-        count = self._batch_execute(query, unique_drugs)
+        count = self._iterate_execute(query, unique_drugs)
         logger.info("Loaded Drug nodes", count=count)
         return count
     
@@ -218,20 +327,24 @@ class Neo4jLoader:
         Returns:
             Number of nodes created/updated
         """
-        df = self._load_staged("conditions")
+        df = self._load_staged("conditions", columns=['condition_key', 'name'])
         if df is None or df.empty:
             return 0
         
-        # Get unique conditions
-        unique_conditions = df.groupby('condition_key').agg({
-            'name': 'first',
-        }).reset_index()
+        # Get unique conditions (rows without a key cannot be merged)
+        unique_conditions = df.dropna(subset=['condition_key']).drop_duplicates(subset=['condition_key'])
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MERGE (c:Condition {condition_key: row.condition_key})
-        SET c.name = row.name,
-            c.updated_at = datetime()
+        WITH c, now, {name: row.name} AS props
+        WHERE c.updated_at IS NULL OR any(
+            key IN keys(props)
+            WHERE coalesce(c[key] <> props[key], c[key] IS NOT NULL OR props[key] IS NOT NULL)
+        )
+        SET c += props,
+            c.updated_at = now
         """
         
         count = self._batch_execute(query, unique_conditions)
@@ -245,7 +358,9 @@ class Neo4jLoader:
         Returns:
             Number of relationships created
         """
-        df = self._load_staged("trial_organizations")
+        df = self._load_staged("trial_organizations", columns=[
+            'nct_id', 'org_key', 'relationship_type',
+        ])
         if df is None or df.empty:
             return 0
         
@@ -258,24 +373,26 @@ class Neo4jLoader:
         # Load SPONSORED_BY relationships
         if not sponsors.empty:
             query = """
+            WITH datetime() AS now
             UNWIND $batch AS row
             MATCH (t:Trial {nct_id: row.nct_id})
             MATCH (o:Organization {org_key: row.org_key})
             MERGE (t)-[r:SPONSORED_BY]->(o)
-            SET r.updated_at = datetime()
+            ON CREATE SET r.updated_at = now
             """
-            count += self._batch_execute(query, sponsors)
+            count += self._in_transactions_execute(query, sponsors)
         
         # Load COLLABORATES_WITH relationships
         if not collaborators.empty:
             query = """
+            WITH datetime() AS now
             UNWIND $batch AS row
             MATCH (t:Trial {nct_id: row.nct_id})
             MATCH (o:Organization {org_key: row.org_key})
             MERGE (t)-[r:COLLABORATES_WITH]->(o)
-            SET r.updated_at = datetime()
+            ON CREATE SET r.updated_at = now
             """
-            count += self._batch_execute(query, collaborators)
+            count += self._in_transactions_execute(query, collaborators)
         
         logger.info("Loaded Trial-Organization relationships", count=count)
         return count
@@ -287,22 +404,33 @@ class Neo4jLoader:
         Returns:
             Number of relationships created
         """
-        df = self._load_staged("drugs")
+        df = self._load_staged("drugs", columns=[
+            'nct_id', 'drug_key', 'route', 'dosage_form', 'intervention_id',
+        ])
         if df is None or df.empty:
             return 0
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MATCH (t:Trial {nct_id: row.nct_id})
         MATCH (d:Drug {drug_key: row.drug_key})
         MERGE (t)-[r:INVESTIGATES]->(d)
-        SET r.route = row.route,
-            r.dosage_form = row.dosage_form,
-            r.intervention_id = row.intervention_id,
-            r.updated_at = datetime()
+        WITH r, now, {
+            route: row.route,
+            dosage_form: row.dosage_form,
+            intervention_id: row.intervention_id
+        } AS props
+        WHERE r.updated_at IS NULL OR any(
+            key IN keys(props)
+            WHERE coalesce(r[key] <> props[key], r[key] IS NOT NULL OR props[key] IS NOT NULL)
+        )
+        SET r += props,
+            r.updated_at = now
         """
         
-        count = self._batch_execute(query, df)
+        # Parallel batches would contend for locks on the shared Trial/Drug nodes
+        count = self._iterate_execute(query, df, parallel=False)
         logger.info("Loaded Trial-Drug relationships", count=count)
         return count
     
@@ -313,19 +441,20 @@ class Neo4jLoader:
         Returns:
             Number of relationships created
         """
-        df = self._load_staged("conditions")
+        df = self._load_staged("conditions", columns=['nct_id', 'condition_key'])
         if df is None or df.empty:
             return 0
         
         query = """
+        WITH datetime() AS now
         UNWIND $batch AS row
         MATCH (t:Trial {nct_id: row.nct_id})
         MATCH (c:Condition {condition_key: row.condition_key})
         MERGE (t)-[r:TARGETS]->(c)
-        SET r.updated_at = datetime()
+        ON CREATE SET r.updated_at = now
         """
         
-        count = self._batch_execute(query, df)
+        count = self._in_transactions_execute(query, df)
         logger.info("Loaded Trial-Condition relationships", count=count)
         return count
     
@@ -340,26 +469,219 @@ class Neo4jLoader:
         Returns:
             Number of records processed
         """
+        records = self._to_records(df)
+        
+        batches = [
+            records[i:i + self.BATCH_SIZE]
+            for i in range(0, len(records), self.BATCH_SIZE)
+        ]
+        
+        # Commit several batches per explicit write transaction to amortize
+        # the commit and transaction log flush over more rows
+        tx_groups = [
+            batches[i:i + self.BATCHES_PER_TRANSACTION]
+            for i in range(0, len(batches), self.BATCHES_PER_TRANSACTION)
+        ]
+        
+        return self._run_async(self._execute_async(query, tx_groups))
+    
+    def _run_async(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the loader's event loop and wait for it.
+        
+        The async driver is bound to one event loop, so a single loop runs
+        in a background thread for the loader's lifetime and the load
+        threads submit their work to it.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="neo4j-async-writes",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    async def _execute_async(
+        self,
+        query: str,
+        tx_groups: List[List[List[Dict[str, Any]]]],
+    ) -> int:
+        """
+        Run write transactions concurrently on an async driver.
+        
+        Keeps up to MAX_CONCURRENT_TRANSACTIONS transactions in flight so
+        the Bolt round-trips overlap instead of running one after another.
+        The driver and the limit are shared by all loads running at once.
+        Runs on the loader's event loop (see ``_run_async``).
+        
+        Args:
+            query: Cypher query with $batch parameter
+            tx_groups: Batches to commit together, one list per transaction
+            
+        Returns:
+            Number of records processed
+        """
+        # Only the loop thread gets here, so creating these is race-free
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                max_connection_pool_size=self.MAX_CONCURRENT_TRANSACTIONS,
+            )
+            self._write_slots = asyncio.Semaphore(self.MAX_CONCURRENT_TRANSACTIONS)
+        driver = self._async_driver
+        write_slots = self._write_slots
         total = 0
-        records = df.to_dict('records')
         
-        # Replace NaN/None with None for Neo4j
-        for record in records:
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
+        async def write(tx_batches: List[List[Dict[str, Any]]]) -> None:
+            nonlocal total
+            async with write_slots:
+                async with driver.session() as session:
+                    await session.execute_write(self._run_batches_async, query, tx_batches)
+            
+            total += sum(len(batch) for batch in tx_batches)
+            logger.debug(f"Processed {total} records...")
+        
+        await asyncio.gather(*(write(tx_batches) for tx_batches in tx_groups))
+        
+        return total
+    
+    def _iterate_execute(
+        self,
+        query: str,
+        df: pd.DataFrame,
+        parallel: bool = True,
+    ) -> int:
+        """
+        Execute query with server-side batching via apoc.periodic.iterate.
+        
+        The rows are uploaded in large chunks and Neo4j splits each chunk
+        into transactions itself (in parallel when allowed). Falls back to
+        _batch_execute when APOC is not installed.
+        
+        Args:
+            query: Cypher query starting with WITH datetime() AS now UNWIND $batch AS row
+            df: DataFrame to process
+            parallel: Whether Neo4j may run the batches concurrently
+            
+        Returns:
+            Number of records processed
+        """
+        if not self.has_apoc:
+            return self._batch_execute(query, df)
+        
+        # apoc.periodic.iterate binds each row itself
+        action = self._row_statement(query)
+        iterate_query = """
+        CALL apoc.periodic.iterate(
+            'WITH datetime() AS now UNWIND $batch AS row RETURN row, now',
+            $action,
+            {batchSize: $batch_size, parallel: $parallel, retries: $retries, params: {batch: $batch}}
+        )
+        YIELD failedOperations, errorMessages
+        RETURN failedOperations, errorMessages
+        """
+        
+        total = 0
+        records = self._to_records(df)
         
         with self.driver.session() as session:
-            for i in range(0, len(records), self.BATCH_SIZE):
-                batch = records[i:i + self.BATCH_SIZE]
-                session.run(query, batch=batch)
-                total += len(batch)
+            for i in range(0, len(records), self.APOC_CHUNK_SIZE):
+                chunk = records[i:i + self.APOC_CHUNK_SIZE]
+                result = session.run(
+                    iterate_query,
+                    action=action,
+                    batch_size=self.APOC_BATCH_SIZE,
+                    parallel=parallel,
+                    retries=self.APOC_RETRIES,
+                    batch=chunk,
+                ).single()
+                
+                if result["failedOperations"]:
+                    logger.error("apoc.periodic.iterate failed", errors=result["errorMessages"])
+                    raise RuntimeError(
+                        f"{result['failedOperations']} operations failed: {result['errorMessages']}"
+                    )
                 
-                if total % 1000 == 0:
-                    logger.debug(f"Processed {total} records...")
+                total += len(chunk)
+                logger.debug(f"Processed {total} records...")
         
         return total
     
+    def _in_transactions_execute(self, query: str, df: pd.DataFrame) -> int:
+        """
+        Execute query with CALL { ... } IN TRANSACTIONS.
+        
+        Large chunks of rows are sent per statement and Neo4j commits them
+        in small inner transactions itself, releasing locks as it goes.
+        Such statements must run in auto-commit transactions, so a chunk
+        that hits a deadlock is retried as a whole (MERGE keeps it idempotent).
+        
+        Args:
+            query: Cypher query starting with WITH datetime() AS now UNWIND $batch AS row
+            df: DataFrame to process
+            
+        Returns:
+            Number of records processed
+        """
+        in_transactions_query = f"""
+        WITH datetime() AS now
+        UNWIND $batch AS row
+        CALL {{
+            WITH row, now
+            {self._row_statement(query)}
+        }} IN TRANSACTIONS OF {self.IN_TRANSACTIONS_ROWS} ROWS
+        """
+        
+        total = 0
+        records = self._to_records(df)
+        
+        with self.driver.session() as session:
+            for i in range(0, len(records), self.IN_TRANSACTIONS_CHUNK_SIZE):
+                chunk = records[i:i + self.IN_TRANSACTIONS_CHUNK_SIZE]
+                
+                for attempt in range(1, self.IN_TRANSACTIONS_RETRIES + 1):
+                    try:
+                        session.run(in_transactions_query, batch=chunk).consume()
+                        break
+                    except TransientError as e:
+                        if attempt == self.IN_TRANSACTIONS_RETRIES:
+                            raise
+                        logger.warning("Retrying chunk after transient error", attempt=attempt, error=str(e))
+                
+                total += len(chunk)
+                logger.debug(f"Processed {total} records...")
+        
+        return total
+    
+    @staticmethod
+    def _row_statement(query: str) -> str:
+        """Strip the batch prefix, leaving the statement run for each row and now."""
+        return re.sub(r"^\s*WITH datetime\(\) AS now\s+UNWIND \$batch AS row\s*", "", query)
+    
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a DataFrame to Bolt parameter records."""
+        # Replace NaN/None with None for Neo4j in one vectorized pass
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+    
+    @staticmethod
+    async def _run_batches_async(tx, query: str, batches: List[List[Dict[str, Any]]]) -> None:
+        """Run a batch query once per batch inside a single transaction."""
+        for batch in batches:
+            result = await tx.run(query, batch=batch)
+            await result.consume()
+    
     def load_all(self) -> Dict[str, Any]:
         """
         Load all staged data into Neo4j.
@@ -377,23 +699,54 @@ class Neo4jLoader:
         # Create constraints first
         self.create_constraints_and_indexes()
         
-        # Load nodes
-        stats['trials'] = self.load_trials()
-        stats['organizations'] = self.load_organizations()
-        stats['drugs'] = self.load_drugs()
-        stats['conditions'] = self.load_conditions()
-        
-        # Load relationships
-        stats['trial_org_rels'] = self.load_trial_organization_relationships()
-        stats['trial_drug_rels'] = self.load_trial_drug_relationships()
-        stats['trial_condition_rels'] = self.load_trial_condition_relationships()
+        # Load nodes (disjoint labels, so the loads run concurrently)
+        stats.update(self._run_concurrently({
+            'trials': self.load_trials,
+            'organizations': self.load_organizations,
+            'drugs': self.load_drugs,
+            'conditions': self.load_conditions,
+        }))
+        
+        # Load relationships once every node exists
+        stats.update(self._run_concurrently({
+            'trial_org_rels': self.load_trial_organization_relationships,
+            'trial_drug_rels': self.load_trial_drug_relationships,
+            'trial_condition_rels': self.load_trial_condition_relationships,
+        }))
         
         logger.info("Neo4j loading completed", **stats)
         return stats
     
+    def _run_concurrently(self, loads: Dict[str, Callable[[], int]]) -> Dict[str, int]:
+        """
+        Run independent loads in parallel threads.
+        
+        Each load opens its own session on the shared, thread-safe driver.
+        
+        Args:
+            loads: Mapping of stats key to load method
+            
+        Returns:
+            Mapping of stats key to number of records loaded
+        """
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {name: executor.submit(load) for name, load in loads.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
     def close(self) -> None:
-        """Close database connection."""
+        """Close database connections and stop the async write loop."""
         if self._driver:
             self._driver.close()
             self._driver = None
+        
+        if self._loop is not None:
+            if self._async_driver is not None:
+                self._run_async(self._async_driver.close())
+                self._async_driver = None
+                self._write_slots = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
 
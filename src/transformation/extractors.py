@@ -5,15 +5,276 @@ Uses regex patterns to extract information from intervention descriptions.
 """
 
 import re
+import threading
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from functools import lru_cache
+from typing import Dict, Iterator, List, Match, Optional, Set, Tuple
+
+import pandas as pd
 
 from src.utils import get_logger
 
+# RE2 (google-re2) matches in linear time; optional, Python re is the fallback
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Hyperscan scans for every label in one SIMD pass; optional as well
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = get_logger(__name__)
 
 
+def _widen_whitespace(pattern: str) -> str:
+    """Spell out Python's ASCII ``\\s`` for engines whose ``\\s`` is narrower."""
+    return pattern.replace(r'\s', r'[\s\v\x1c-\x1f]')
+
+
+def prepare_text(text: str) -> str:
+    """
+    Prepare a text for matching: lower-case it once if it is ASCII.
+    
+    ASCII text is then matched case-sensitively against the lowercase
+    patterns, sparing the regex engine the per-character case folding.
+    Other text is kept as-is and matched case-insensitively, since
+    ``str.lower`` and regex case folding differ outside ASCII.
+    
+    Args:
+        text: Raw text
+        
+    Returns:
+        Text ready for the extractors' matchers
+    """
+    return text.lower() if text.isascii() else text
+
+
+class _Regex:
+    """
+    Pattern matched against texts prepared by ``prepare_text``.
+    
+    Lower-cased ASCII text runs case-sensitively, on RE2 when it is
+    installed; other text runs case-insensitively on Python ``re``. RE2's
+    ``\\b`` and ``\\w`` are ASCII-only, so it only sees ASCII text, where
+    both engines agree; ``\\s`` is widened to Python's ASCII whitespace
+    set for the same reason.
+    """
+    
+    # Enough for the fused alternations' DFAs
+    RE2_MAX_MEM = 64 << 20
+    
+    def __init__(self, pattern: str):
+        """
+        Compile the pattern for the available engines.
+        
+        Args:
+            pattern: Regex source (lowercase literals)
+        """
+        self.pattern = pattern
+        self._re = re.compile(pattern, re.IGNORECASE)
+        self._ascii = re.compile(pattern)
+        if re2 is not None:
+            options = re2.Options()
+            options.max_mem = self.RE2_MAX_MEM
+            self._ascii = re2.compile(_widen_whitespace(pattern), options)
+    
+    def _engine(self, text: str):
+        """Pick the engine for a prepared text."""
+        return self._ascii if text.isascii() else self._re
+    
+    def search(self, text: str) -> Optional[Match]:
+        """Search a prepared text for the pattern."""
+        return self._engine(text).search(text)
+    
+    def finditer(self, text: str) -> Iterator[Match]:
+        """Iterate over the non-overlapping matches in a prepared text."""
+        return self._engine(text).finditer(text)
+
+
+class _LabelMatcher:
+    """
+    Finds which labels of a pattern table occur in a text.
+    
+    The patterns are fused into a single alternation with one named group
+    per label, so one ``finditer`` pass over a text finds every label
+    instead of running one search per label. When Hyperscan is installed,
+    ASCII texts are instead scanned by a multi-pattern database holding one
+    expression per label, reporting each label at most once.
+    """
+    
+    def __init__(self, patterns_by_label: Dict[str, List[str]]):
+        """
+        Build the matcher.
+        
+        Args:
+            patterns_by_label: Mapping of label to its regex patterns
+        """
+        self.labels = list(patterns_by_label)
+        sources = ['|'.join(f'({p})' for p in patterns) for patterns in patterns_by_label.values()]
+        
+        self._regex = _Regex(
+            '|'.join(f"(?P<{label}>{source})" for label, source in zip(self.labels, sources))
+        )
+        
+        self._hs_db = None
+        self._hs_lock = threading.Lock()
+        if hyperscan is not None:
+            # ASCII-only like RE2 (and fed lower-cased text), so the same
+            # whitespace widening applies
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=[_widen_whitespace(source).encode() for source in sources],
+                ids=list(range(len(sources))),
+                elements=len(sources),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(sources),
+            )
+    
+    def find(self, text: str, wanted: Optional[Set[str]] = None) -> Set[str]:
+        """
+        Scan a text once for labels.
+        
+        Args:
+            text: Text prepared by ``prepare_text``
+            wanted: Labels still to be found (default: all); scanning stops
+                once all are seen
+            
+        Returns:
+            Subset of ``wanted`` found in the text
+        """
+        if wanted is None:
+            wanted = set(self.labels)
+        found: Set[str] = set()
+        if not wanted:
+            return found
+        
+        if self._hs_db is not None and text.isascii():
+            ids: Set[int] = set()
+            # Matchers are shared across threads; a database's scratch space isn't
+            with self._hs_lock:
+                self._hs_db.scan(text.encode(), match_event_handler=_collect_match_id, context=ids)
+            return {self.labels[i] for i in ids} & wanted
+        
+        for match in self._regex.finditer(text):
+            label = match.lastgroup
+            if label in wanted:
+                found.add(label)
+                if len(found) == len(wanted):
+                    break
+        return found
+    
+    def first(self, text: str) -> Optional[str]:
+        """
+        Find the first label, in pattern order, occurring in a text.
+        
+        Args:
+            text: Text prepared by ``prepare_text``
+            
+        Returns:
+            Label or None if none matched
+        """
+        found = self.find(text)
+        return next((label for label in self.labels if label in found), None)
+
+
+@lru_cache(maxsize=None)
+def _shared_matcher(pattern_table: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> _LabelMatcher:
+    """
+    Compile a pattern table once per process and share the matcher.
+    
+    Args:
+        pattern_table: Hashable ``(label, patterns)`` pairs in label order
+        
+    Returns:
+        Label matcher for the table
+    """
+    return _LabelMatcher({label: list(patterns) for label, patterns in pattern_table})
+
+
+def _pattern_table(patterns_by_label: Dict[str, List[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Freeze a pattern table into a hashable key for ``_shared_matcher``."""
+    return tuple((label, tuple(patterns)) for label, patterns in patterns_by_label.items())
+
+
+def _collect_match_id(match_id: int, start: int, end: int, flags: int, ids: Set[int]) -> None:
+    """Hyperscan match callback recording the matched expression id."""
+    ids.add(match_id)
+
+
+def _primary_labels(matcher: _LabelMatcher, index: pd.Index, sources: List[pd.Series]) -> pd.Series:
+    """
+    Find the primary label for every row of a set of text columns.
+    
+    Column-wise equivalent of ``extract_primary``: the first label (in
+    pattern order) matching the most reliable source wins. Each source is
+    only scanned for the rows still unresolved.
+    
+    Args:
+        matcher: Matcher for the extractor's pattern table
+        index: Index of the rows
+        sources: Prepared text columns in order of reliability
+        
+    Returns:
+        Series of labels, None where nothing matched
+    """
+    primary = pd.Series([None] * len(index), index=index, dtype=object)
+    for source in sources:
+        text = source[primary[source.index].isna().to_numpy()]
+        labels = text.map(matcher.first).dropna()
+        primary[labels.index] = labels
+    return primary
+
+
 @dataclass
+class ExtractionContext:
+    """
+    Intervention text columns prepared once and shared by the extractors.
+    
+    Each column holds only its non-empty texts, already passed through
+    ``prepare_text``.
+    """
+    index: pd.Index
+    name: pd.Series
+    description: pd.Series
+    design_group_desc: pd.Series
+    
+    @classmethod
+    def from_columns(
+        cls,
+        name: pd.Series,
+        description: pd.Series,
+        design_group_desc: Optional[pd.Series] = None,
+    ) -> "ExtractionContext":
+        """
+        Prepare the text columns of a DataFrame.
+        
+        Args:
+            name: Intervention names
+            description: Intervention descriptions
+            design_group_desc: Design group descriptions, if any
+            
+        Returns:
+            Extraction context for the rows
+        """
+        if design_group_desc is None:
+            design_group_desc = pd.Series(None, index=name.index, dtype=object)
+        
+        def prepare(column: pd.Series) -> pd.Series:
+            column = column.dropna()
+            column = column[column != '']
+            return column.astype(str).astype(object).map(prepare_text)
+        
+        return cls(
+            index=name.index,
+            name=prepare(name),
+            description=prepare(description),
+            design_group_desc=prepare(design_group_desc),
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class ExtractionResult:
     """Result of extraction with confidence."""
     value: str
@@ -21,6 +282,50 @@ class ExtractionResult:
     confidence: float  # 0.0 to 1.0
 
 
+def _iter_results(
+    matcher: _LabelMatcher,
+    sources: List[Tuple[str, Optional[str], float]],
+) -> Iterator[ExtractionResult]:
+    """
+    Lazily yield the labels found in a set of texts, best first.
+    
+    Sources are scanned in order of reliability, each only when the
+    caller asks for more: the first result is the primary label, so
+    taking just that skips the remaining sources.
+    
+    Args:
+        matcher: Matcher for the extractor's pattern table
+        sources: ``(source name, raw text, confidence)`` in order of reliability
+        
+    Yields:
+        Each label once, from the most reliable source it occurs in, in
+        pattern order within a source
+    """
+    found: Set[str] = set()
+    
+    for source_name, text, base_confidence in sources:
+        if not text:
+            continue
+        
+        # One pass over the text for the labels not found yet
+        matched = matcher.find(
+            prepare_text(str(text)),
+            {label for label in matcher.labels if label not in found},
+        )
+        for label in matcher.labels:
+            if label in matched:
+                found.add(label)
+                yield ExtractionResult(
+                    value=label,
+                    source=source_name,
+                    confidence=base_confidence,
+                )
+        
+        # Every label found: the remaining sources can't add anything
+        if len(found) == len(matcher.labels):
+            return
+
+
 class RouteExtractor:
     """
     Extracts route of administration from text.
@@ -82,11 +387,8 @@ class RouteExtractor:
     }
     
     def __init__(self):
-        """Initialize extractor with compiled patterns."""
-        self._compiled_patterns = {}
-        for route, patterns in self.ROUTE_PATTERNS.items():
-            combined = '|'.join(f'({p})' for p in patterns)
-            self._compiled_patterns[route] = re.compile(combined, re.IGNORECASE)
+        """Initialize extractor with the label matcher shared by all instances."""
+        self._matcher = _shared_matcher(_pattern_table(self.ROUTE_PATTERNS))
     
     def extract(
         self,
@@ -105,35 +407,8 @@ class RouteExtractor:
         Returns:
             List of extracted routes with source and confidence
         """
-        results = []
-        found_routes: Set[str] = set()
-        
         # Check each text source (in order of reliability)
-        sources = [
-            ('description', description, 0.9),
-            ('design_group', design_group_desc, 0.8),
-            ('name', name, 0.7),
-        ]
-        
-        for source_name, text, base_confidence in sources:
-            if not text:
-                continue
-                
-            text = str(text)
-            
-            for route, pattern in self._compiled_patterns.items():
-                if route in found_routes:
-                    continue
-                    
-                if pattern.search(text):
-                    results.append(ExtractionResult(
-                        value=route,
-                        source=source_name,
-                        confidence=base_confidence,
-                    ))
-                    found_routes.add(route)
-        
-        return results
+        return list(_iter_results(self._matcher, self._sources(name, description, design_group_desc)))
     
     def extract_primary(
         self,
@@ -152,12 +427,59 @@ class RouteExtractor:
         Returns:
             Primary route or None if not found
         """
-        results = self.extract(name, description, design_group_desc)
-        if results:
-            # Return highest confidence result
-            best = max(results, key=lambda r: r.confidence)
-            return best.value
-        return None
+        # The first result comes from the first source with a match
+        result = next(_iter_results(self._matcher, self._sources(name, description, design_group_desc)), None)
+        return result.value if result else None
+    
+    @staticmethod
+    def _sources(
+        name: Optional[str],
+        description: Optional[str],
+        design_group_desc: Optional[str],
+    ) -> List[Tuple[str, Optional[str], float]]:
+        """Text sources with their confidence, most reliable first."""
+        return [
+            ('description', description, 0.9),
+            ('design_group', design_group_desc, 0.8),
+            ('name', name, 0.7),
+        ]
+    
+    def extract_primary_column(
+        self,
+        name: pd.Series,
+        description: pd.Series,
+        design_group_desc: pd.Series,
+    ) -> pd.Series:
+        """
+        Extract the primary route for every row of a DataFrame.
+        
+        Args:
+            name: Intervention names
+            description: Intervention descriptions
+            design_group_desc: Design group descriptions
+            
+        Returns:
+            Primary route per row, None where not found
+        """
+        return self.extract_primary_from_context(
+            ExtractionContext.from_columns(name, description, design_group_desc)
+        )
+    
+    def extract_primary_from_context(self, context: ExtractionContext) -> pd.Series:
+        """
+        Extract the primary route for every row of a prepared context.
+        
+        Args:
+            context: Prepared intervention text columns
+            
+        Returns:
+            Primary route per row, None where not found
+        """
+        return _primary_labels(
+            self._matcher,
+            context.index,
+            [context.description, context.design_group_desc, context.name],
+        )
 
 
 class DosageFormExtractor:
@@ -203,11 +525,8 @@ class DosageFormExtractor:
     }
     
     def __init__(self):
-        """Initialize extractor with compiled patterns."""
-        self._compiled_patterns = {}
-        for form, patterns in self.FORM_PATTERNS.items():
-            combined = '|'.join(f'({p})' for p in patterns)
-            self._compiled_patterns[form] = re.compile(combined, re.IGNORECASE)
+        """Initialize extractor with the label matcher shared by all instances."""
+        self._matcher = _shared_matcher(_pattern_table(self.FORM_PATTERNS))
     
     def extract(
         self,
@@ -224,33 +543,7 @@ class DosageFormExtractor:
         Returns:
             List of extracted forms with source and confidence
         """
-        results = []
-        found_forms: Set[str] = set()
-        
-        sources = [
-            ('description', description, 0.9),
-            ('name', name, 0.7),
-        ]
-        
-        for source_name, text, base_confidence in sources:
-            if not text:
-                continue
-                
-            text = str(text)
-            
-            for form, pattern in self._compiled_patterns.items():
-                if form in found_forms:
-                    continue
-                    
-                if pattern.search(text):
-                    results.append(ExtractionResult(
-                        value=form,
-                        source=source_name,
-                        confidence=base_confidence,
-                    ))
-                    found_forms.add(form)
-        
-        return results
+        return list(_iter_results(self._matcher, self._sources(name, description)))
     
     def extract_primary(
         self,
@@ -267,9 +560,47 @@ class DosageFormExtractor:
         Returns:
             Primary form or None if not found
         """
-        results = self.extract(name, description)
-        if results:
-            best = max(results, key=lambda r: r.confidence)
-            return best.value
-        return None
+        # The first result comes from the first source with a match
+        result = next(_iter_results(self._matcher, self._sources(name, description)), None)
+        return result.value if result else None
+    
+    @staticmethod
+    def _sources(
+        name: Optional[str],
+        description: Optional[str],
+    ) -> List[Tuple[str, Optional[str], float]]:
+        """Text sources with their confidence, most reliable first."""
+        return [
+            ('description', description, 0.9),
+            ('name', name, 0.7),
+        ]
+    
+    def extract_primary_column(
+        self,
+        name: pd.Series,
+        description: pd.Series,
+    ) -> pd.Series:
+        """
+        Extract the primary dosage form for every row of a DataFrame.
+        
+        Args:
+            name: Intervention names
+            description: Intervention descriptions
+            
+        Returns:
+            Primary form per row, None where not found
+        """
+        return self.extract_primary_from_context(ExtractionContext.from_columns(name, description))
+    
+    def extract_primary_from_context(self, context: ExtractionContext) -> pd.Series:
+        """
+        Extract the primary dosage form for every row of a prepared context.
+        
+        Args:
+            context: Prepared intervention text columns
+            
+        Returns:
+            Primary form per row, None where not found
+        """
+        return _primary_labels(self._matcher, context.index, [context.description, context.name])
 
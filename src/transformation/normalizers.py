@@ -5,12 +5,46 @@ Handles common variations, suffixes, and inconsistencies in entity names.
 """
 
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
 
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns shared by the normalizers, compiled once at import
+_TRAIL_PUNCT_RE = re.compile(r'[,\.\-]+$')
+_NON_ALNUM_ORG_RE = re.compile(r'[^a-z0-9\s]')
+_NON_ALNUM_DRUG_RE = re.compile(r'[^a-z0-9\s\-]')
+_DIGIT_RE = re.compile(r'\d')
+
+
+def _per_distinct(values: pd.Series, normalize_column: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Apply a column normalization once per distinct value.
+    
+    Names recur across many trials, so the work is done on the distinct
+    values only and broadcast back to every row.
+    
+    Args:
+        values: Raw names
+        normalize_column: Normalization of an object-dtype column
+        
+    Returns:
+        Normalized values aligned with ``values``, object dtype
+    """
+    codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=False)
+    normalized = normalize_column(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(normalized[codes], index=values.index, dtype=object)
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs to single spaces and strip both ends."""
+    # str.split() splits on exactly the characters re's \s matches, in C
+    return ' '.join(text.split())
+
 
 class OrganizationNormalizer:
     """
@@ -23,26 +57,27 @@ class OrganizationNormalizer:
     - Common abbreviation expansion
     """
     
-    # Suffixes to remove for normalized comparison
+    # Suffixes to remove for normalized comparison (only at the very end,
+    # optionally after a comma)
     SUFFIXES_TO_REMOVE = [
-        r',?\s*Inc\.?$',
-        r',?\s*Incorporated$',
-        r',?\s*Ltd\.?$',
-        r',?\s*Limited$',
-        r',?\s*Corp\.?$',
-        r',?\s*Corporation$',
-        r',?\s*LLC$',
-        r',?\s*L\.L\.C\.?$',
-        r',?\s*Co\.?$',
-        r',?\s*Company$',
-        r',?\s*PLC$',
-        r',?\s*P\.L\.C\.?$',
-        r',?\s*GmbH$',
-        r',?\s*AG$',
-        r',?\s*S\.A\.?$',
-        r',?\s*S\.p\.A\.?$',
-        r',?\s*N\.V\.?$',
-        r',?\s*B\.V\.?$',
+        r'Inc\.?',
+        r'Incorporated',
+        r'Ltd\.?',
+        r'Limited',
+        r'Corp\.?',
+        r'Corporation',
+        r'LLC',
+        r'L\.L\.C\.?',
+        r'Co\.?',
+        r'Company',
+        r'PLC',
+        r'P\.L\.C\.?',
+        r'GmbH',
+        r'AG',
+        r'S\.A\.?',
+        r'S\.p\.A\.?',
+        r'N\.V\.?',
+        r'B\.V\.?',
     ]
     
     # Common abbreviations to expand
@@ -62,13 +97,27 @@ class OrganizationNormalizer:
         'WHO': 'World Health Organization',
     }
     
+    # Distinct names memoized per normalizer (sponsors recur across many trials)
+    CACHE_SIZE = 65536
+    
     def __init__(self):
         """Initialize the normalizer."""
         # Compile suffix patterns for efficiency
+        # One alternation behind a shared prefix: the comma and whitespace
+        # are matched once per position instead of once per suffix
         self._suffix_pattern = re.compile(
-            '|'.join(self.SUFFIXES_TO_REMOVE),
+            r',?\s*(?:' + '|'.join(self.SUFFIXES_TO_REMOVE) + r')$',
             re.IGNORECASE
         )
+        # Longest text a suffix match can span in a whitespace-collapsed
+        # name: a comma, one space and the longest suffix literal
+        self._suffix_window = 2 + max(
+            len(re.sub(r'\\(.)|\?', r'\1', suffix))
+            for suffix in self.SUFFIXES_TO_REMOVE
+        )
+        
+        self._normalize_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._normalize)
+        self._normalize_for_key_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._normalize_for_key)
     
     def normalize(self, name: Optional[str]) -> str:
         """
@@ -82,24 +131,32 @@ class OrganizationNormalizer:
         """
         if not name or not isinstance(name, str):
             return ""
+        return self._normalize_cached(name)
+    
+    def _normalize(self, name: str) -> str:
+        """Normalize a non-empty organization name (uncached)."""
+        # Collapse and strip whitespace in one pass. Done before the suffix
+        # search so its \s* never rescans a long whitespace run from every
+        # position in it (quadratic on pathological names).
+        normalized = _collapse_whitespace(name)
         
-        # Strip whitespace
-        normalized = name.strip()
-        
-        # Remove common suffixes
-        normalized = self._suffix_pattern.sub('', normalized)
-        
-        # Normalize whitespace (multiple spaces to single)
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Strip again after suffix removal
-        normalized = normalized.strip()
+        # Remove the common suffix (anchored at the end, so at most one)
+        normalized = self._strip_suffix(normalized)
         
-        # Remove trailing punctuation
-        normalized = re.sub(r'[,\.\-]+$', '', normalized).strip()
+        # Remove trailing punctuation (and the space a removed suffix leaves)
+        normalized = normalized.rstrip().rstrip(',.-').strip()
         
         return normalized
     
+    def _strip_suffix(self, name: str) -> str:
+        """Remove a legal suffix from a whitespace-collapsed name."""
+        # An end-anchored match fits in the last few characters, so only
+        # those are searched rather than every position of the name
+        cut = len(name) - self._suffix_window
+        if cut <= 0:
+            return self._suffix_pattern.sub('', name, count=1)
+        return name[:cut] + self._suffix_pattern.sub('', name[cut:], count=1)
+    
     def normalize_for_key(self, name: Optional[str]) -> str:
         """
         Create a normalized key for deduplication.
@@ -112,19 +169,78 @@ class OrganizationNormalizer:
         Returns:
             Lowercase normalized key
         """
+        if not name or not isinstance(name, str):
+            return ""
+        return self._normalize_for_key_cached(name)
+    
+    def _normalize_for_key(self, name: str) -> str:
+        """Create the deduplication key for a non-empty name (uncached)."""
         normalized = self.normalize(name)
         
         # Lowercase for key
         key = normalized.lower()
         
         # Remove all non-alphanumeric except spaces
-        key = re.sub(r'[^a-z0-9\s]', '', key)
+        key = _NON_ALNUM_ORG_RE.sub('', key)
         
         # Normalize whitespace again
-        key = re.sub(r'\s+', ' ', key).strip()
+        key = _collapse_whitespace(key)
         
         return key
     
+    def normalize_series(self, names: pd.Series) -> pd.Series:
+        """
+        Normalize a column of organization names.
+        
+        Column-wise equivalent of ``normalize``: one pass per rule over
+        the distinct names instead of one Python call per row.
+        
+        Args:
+            names: Raw organization names
+            
+        Returns:
+            Normalized names ("" for missing or non-string values)
+        """
+        return _per_distinct(names, self._normalize_column)
+    
+    def normalize_key_series(self, names: pd.Series) -> pd.Series:
+        """
+        Create deduplication keys for a column of organization names.
+        
+        Column-wise equivalent of ``normalize_for_key``.
+        
+        Args:
+            names: Raw organization names
+            
+        Returns:
+            Lowercase normalized keys
+        """
+        return _per_distinct(names, self._normalize_key_column)
+    
+    def _normalize_column(self, names: pd.Series) -> pd.Series:
+        """Normalize an object-dtype column of names."""
+        # Object dtype keeps Python string/regex semantics for every backend
+        names = names.where(names.map(lambda n: isinstance(n, str)), '')
+        
+        return (
+            names.map(_collapse_whitespace)
+            .map(self._strip_suffix)
+            .astype(object)  # map infers the backend's string dtype
+            .str.rstrip()
+            .str.replace(_TRAIL_PUNCT_RE, '', regex=True)
+            .str.strip()
+        )
+    
+    def _normalize_key_column(self, names: pd.Series) -> pd.Series:
+        """Create deduplication keys for an object-dtype column of names."""
+        return (
+            self._normalize_column(names)
+            .str.lower()
+            .str.replace(_NON_ALNUM_ORG_RE, '', regex=True)
+            .map(_collapse_whitespace)
+            .astype(object)
+        )
+    
     def get_display_name(self, name: Optional[str]) -> str:
         """
         Get a clean display name (preserves case but cleans up).
@@ -136,6 +252,18 @@ class OrganizationNormalizer:
             Clean display name
         """
         return self.normalize(name)
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """
+        Report hit/miss counts of the memoized normalizations.
+        
+        Returns:
+            Cache statistics per method
+        """
+        return {
+            'normalize': self._normalize_cached.cache_info()._asdict(),
+            'normalize_for_key': self._normalize_for_key_cached.cache_info()._asdict(),
+        }
 
 
 class DrugNormalizer:
@@ -148,20 +276,31 @@ class DrugNormalizer:
     - Common formatting variations
     """
     
-    # Patterns for dosage information to remove
+    # Patterns for dosage information to remove. Quantifiers are possessive
+    # (*+, ++): what follows each run can never start inside it, so giving
+    # characters back could not produce a match and is only wasted work.
+    # A number only starts at the head of its digit run ((?<!\d)): a match
+    # from inside the run would end where the one from its head does, and
+    # retrying every digit made long digit runs quadratic.
     DOSAGE_PATTERNS = [
-        r'\s*\d+\s*(?:mg|g|mcg|µg|ml|l|iu|u|%)\b',  # 100mg, 5ml, etc.
-        r'\s*\d+\s*/\s*\d+\s*(?:mg|g|mcg|µg|ml)\b',  # 100/5mg
-        r'\s*\(\d+\s*(?:mg|g|mcg|µg|ml|%)[^)]*\)',   # (100mg)
-        r'\s*\d+(?:\.\d+)?\s*%',  # 0.5%
+        r'\s*+(?<!\d)\d++\s*+(?:mg|g|mcg|µg|ml|l|iu|u|%)\b',  # 100mg, 5ml, etc.
+        r'\s*+(?<!\d)\d++\s*+/\s*+\d++\s*+(?:mg|g|mcg|µg|ml)\b',  # 100/5mg
+        r'\s*+\(\d++\s*+(?:mg|g|mcg|µg|ml|%)[^)]*+\)',   # (100mg)
+        r'\s*+(?<!\d)\d++(?:\.\d++)?\s*+%',  # 0.5%
     ]
     
+    # Distinct names memoized per normalizer (drugs recur across many trials)
+    CACHE_SIZE = 65536
+    
     def __init__(self):
         """Initialize the normalizer."""
         self._dosage_pattern = re.compile(
             '|'.join(self.DOSAGE_PATTERNS),
             re.IGNORECASE
         )
+        
+        self._normalize_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._normalize)
+        self._normalize_for_key_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._normalize_for_key)
     
     def normalize(self, name: Optional[str]) -> str:
         """
@@ -175,14 +314,12 @@ class DrugNormalizer:
         """
         if not name or not isinstance(name, str):
             return ""
-        
-        # Strip whitespace
-        normalized = name.strip()
-        
-        # Normalize whitespace
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        return normalized
+        return self._normalize_cached(name)
+    
+    def _normalize(self, name: str) -> str:
+        """Normalize a non-empty drug name (uncached)."""
+        # Strip and normalize whitespace
+        return _collapse_whitespace(name)
     
     def normalize_for_key(self, name: Optional[str]) -> str:
         """
@@ -194,22 +331,57 @@ class DrugNormalizer:
         Returns:
             Lowercase normalized key without dosage info
         """
+        if not name or not isinstance(name, str):
+            return ""
+        return self._normalize_for_key_cached(name)
+    
+    def _normalize_for_key(self, name: str) -> str:
+        """Create the deduplication key for a non-empty name (uncached)."""
         normalized = self.normalize(name)
         
-        # Remove dosage information
-        key = self._dosage_pattern.sub('', normalized)
+        # Remove dosage information (every dosage pattern needs a digit)
+        key = self._dosage_pattern.sub('', normalized) if _DIGIT_RE.search(normalized) else normalized
         
         # Lowercase
         key = key.lower()
         
         # Remove non-alphanumeric except spaces and hyphens
-        key = re.sub(r'[^a-z0-9\s\-]', '', key)
+        key = _NON_ALNUM_DRUG_RE.sub('', key)
         
         # Normalize whitespace
-        key = re.sub(r'\s+', ' ', key).strip()
+        key = _collapse_whitespace(key)
         
         return key
     
+    def normalize_series(self, names: pd.Series) -> pd.Series:
+        """
+        Normalize a column of drug names.
+        
+        Column equivalent of ``normalize``, computed once per distinct name.
+        
+        Args:
+            names: Raw drug names
+            
+        Returns:
+            Normalized names ("" for missing or non-string values)
+        """
+        return _per_distinct(names, lambda distinct: distinct.map(self.normalize))
+    
+    def normalize_key_series(self, names: pd.Series) -> pd.Series:
+        """
+        Create deduplication keys for a column of drug names.
+        
+        Column equivalent of ``normalize_for_key``, computed once per
+        distinct name.
+        
+        Args:
+            names: Raw drug names
+            
+        Returns:
+            Lowercase normalized keys without dosage info
+        """
+        return _per_distinct(names, lambda distinct: distinct.map(self.normalize_for_key))
+    
     def get_display_name(self, name: Optional[str]) -> str:
         """
         Get a clean display name.
@@ -221,4 +393,16 @@ class DrugNormalizer:
             Clean display name
         """
         return self.normalize(name)
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """
+        Report hit/miss counts of the memoized normalizations.
+        
+        Returns:
+            Cache statistics per method
+        """
+        return {
+            'normalize': self._normalize_cached.cache_info()._asdict(),
+            'normalize_for_key': self._normalize_for_key_cached.cache_info()._asdict(),
+        }
 
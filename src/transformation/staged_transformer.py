@@ -5,16 +5,21 @@ Transforms raw extracted data into cleaned, normalized staged data
 ready for graph model creation.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import glob
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import os
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.utils import get_logger
 from .normalizers import OrganizationNormalizer, DrugNormalizer
-from .extractors import RouteExtractor, DosageFormExtractor
+from .extractors import ExtractionContext, RouteExtractor, DosageFormExtractor
 
 logger = get_logger(__name__)
 
@@ -31,6 +36,41 @@ class StagedTransformer:
     - Deduplication
     """
     
+    # Raw tables read by the transformations
+    RAW_TABLES = [
+        "studies",
+        "sponsors",
+        "responsible_parties",
+        "interventions",
+        "design_groups",
+        "conditions",
+    ]
+    
+    # Entity transformations run concurrently
+    MAX_WORKERS = 5
+    
+    # Staged files: ZSTD with dictionary-encoded pages (names, routes and
+    # forms repeat heavily), written in bounded row groups
+    PARQUET_OPTIONS = {
+        "compression": "zstd",
+        "use_dictionary": True,
+        "write_statistics": True,
+    }
+    ROW_GROUP_SIZE = 128_000
+    
+    # Study status -> status category (anything else is OTHER)
+    STATUS_CATEGORIES = {
+        'COMPLETED': 'COMPLETED',
+        'RECRUITING': 'ACTIVE',
+        'ENROLLING_BY_INVITATION': 'ACTIVE',
+        'ACTIVE_NOT_RECRUITING': 'ACTIVE',
+        'TERMINATED': 'STOPPED',
+        'WITHDRAWN': 'STOPPED',
+        'SUSPENDED': 'STOPPED',
+        'NOT_YET_RECRUITING': 'PLANNED',
+        'APPROVED_FOR_MARKETING': 'PLANNED',
+    }
+    
     def __init__(self, raw_path: Path, staged_path: Path):
         """
         Initialize transformer.
@@ -50,24 +90,114 @@ class StagedTransformer:
     
     def _get_latest_file(self, pattern: str) -> Optional[Path]:
         """Get the most recent file matching pattern."""
-        files = sorted(glob.glob(str(self.raw_path / f"{pattern}_*.parquet")))
-        return Path(files[-1]) if files else None
+        if not self.raw_path.is_dir():
+            return None
+        
+        # Timestamped names sort chronologically, so the latest is the max name
+        prefix = f"{pattern}_"
+        latest = None
+        with os.scandir(self.raw_path) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith(".parquet"):
+                    if latest is None or entry.name > latest.name:
+                        latest = entry
+        return Path(latest.path) if latest else None
     
-    def _load_raw(self, table_name: str) -> Optional[pd.DataFrame]:
-        """Load raw data for a table."""
+    def _load_raw(
+        self,
+        table_name: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load raw data for a table.
+        
+        Args:
+            table_name: Raw table name
+            columns: Columns to read (default: all)
+            filters: Row filters pushed down to the Parquet reader, in
+                ``pyarrow.parquet.read_table`` form
+            
+        Returns:
+            DataFrame or None if no raw file exists
+        """
         filepath = self._get_latest_file(table_name)
         if filepath and filepath.exists():
             logger.debug(f"Loading {table_name} from {filepath}")
-            return pd.read_parquet(filepath)
+            table = pq.read_table(filepath, columns=columns, filters=filters, memory_map=True)
+            return table.to_pandas(types_mapper=self._arrow_dtype)
         logger.warning(f"No raw data found for {table_name}")
         return None
     
+    @staticmethod
+    def _arrow_dtype(arrow_type: pa.DataType) -> Optional[pd.ArrowDtype]:
+        """
+        Keep raw columns Arrow-backed when loading them into pandas.
+        
+        Dictionary-encoded (categorical) columns keep pandas' default
+        Categorical conversion, which the ``.str`` accessor supports.
+        """
+        if pa.types.is_dictionary(arrow_type):
+            return None
+        return pd.ArrowDtype(arrow_type)
+    
+    def raw_fingerprint(self) -> str:
+        """
+        Compute a content hash of the latest raw file for each input table.
+        
+        Byte-identical raw data yields the same fingerprint regardless of
+        extraction timestamps, so callers can skip re-transforming it.
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        for table_name in self.RAW_TABLES:
+            digest.update(table_name.encode())
+            filepath = self._get_latest_file(table_name)
+            if filepath is None:
+                continue
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+    
+    def cache_key(self) -> str:
+        """
+        Identify the staged output this transformer would produce.
+        
+        Combines the raw data fingerprint with a hash of the transformation
+        package's source, so a deploy that changes the transformation,
+        normalizer or extractor logic invalidates previously staged data.
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(self.raw_fingerprint().encode())
+        for source in sorted(Path(__file__).parent.glob("*.py")):
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+        return digest.hexdigest()
+    
     def _save_staged(self, df: pd.DataFrame, name: str) -> Path:
         """Save staged data."""
         self.staged_path.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = self.staged_path / f"{name}_{timestamp}.parquet"
-        df.to_parquet(filepath, index=False)
+        
+        # Write under a temporary name so a partial file is never the latest
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        try:
+            pq.write_table(
+                pa.Table.from_pandas(df, preserve_index=False),
+                tmp_path,
+                row_group_size=self.ROW_GROUP_SIZE,
+                **self.PARQUET_OPTIONS,
+            )
+            tmp_path.replace(filepath)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
         logger.info(f"Saved staged {name}", rows=len(df), path=str(filepath))
         return filepath
     
@@ -102,26 +232,17 @@ class StagedTransformer:
         staged['phase_clean'] = staged['phase'].str.replace('PHASE', 'Phase ').str.replace('/', '/Phase ')
         
         # Add status category
-        staged['status_category'] = staged['overall_status'].apply(self._categorize_status)
+        status = staged['overall_status'].astype(object)
+        staged['status_category'] = (
+            status.str.upper()
+            .map(self.STATUS_CATEGORIES)
+            .fillna('OTHER')
+            .where(status.notna() & (status != ''), 'UNKNOWN')
+        )
         
         logger.info("Transformed studies", count=len(staged))
         return staged
     
-    def _categorize_status(self, status: str) -> str:
-        """Categorize study status."""
-        if not status:
-            return 'UNKNOWN'
-        status = status.upper()
-        if status in ['COMPLETED']:
-            return 'COMPLETED'
-        elif status in ['RECRUITING', 'ENROLLING_BY_INVITATION', 'ACTIVE_NOT_RECRUITING']:
-            return 'ACTIVE'
-        elif status in ['TERMINATED', 'WITHDRAWN', 'SUSPENDED']:
-            return 'STOPPED'
-        elif status in ['NOT_YET_RECRUITING', 'APPROVED_FOR_MARKETING']:
-            return 'PLANNED'
-        return 'OTHER'
-    
     def transform_organizations(self) -> pd.DataFrame:
         """
         Transform and deduplicate organizations.
@@ -129,52 +250,35 @@ class StagedTransformer:
         Returns:
             Staged organizations DataFrame
         """
-        sponsors = self._load_raw("sponsors")
-        responsible = self._load_raw("responsible_parties")
+        sponsors = self._load_raw("sponsors", columns=['name', 'agency_class'])
+        responsible = self._load_raw("responsible_parties", columns=['organization'])
         
         if sponsors is None or sponsors.empty:
             return pd.DataFrame()
         
-        # Process sponsors
-        orgs = []
-        
-        for _, row in sponsors.iterrows():
-            name = row.get('name', '')
-            if not name or pd.isna(name):
-                continue
-                
-            normalized = self.org_normalizer.normalize(name)
-            key = self.org_normalizer.normalize_for_key(name)
-            
-            orgs.append({
-                'org_key': key,
-                'org_name': normalized,
-                'org_name_original': name,
-                'agency_class': row.get('agency_class', 'UNKNOWN'),
-            })
-        
-        # Process responsible parties (organizations)
+        # Combine sponsor and responsible party organizations
+        frames = [pd.DataFrame({
+            'name': sponsors['name'],
+            'agency_class': sponsors.get('agency_class', 'UNKNOWN'),
+        })]
         if responsible is not None and not responsible.empty:
-            for _, row in responsible.iterrows():
-                org_name = row.get('organization', '')
-                if not org_name or pd.isna(org_name):
-                    continue
-                    
-                normalized = self.org_normalizer.normalize(org_name)
-                key = self.org_normalizer.normalize_for_key(org_name)
-                
-                orgs.append({
-                    'org_key': key,
-                    'org_name': normalized,
-                    'org_name_original': org_name,
-                    'agency_class': 'UNKNOWN',
-                })
-        
-        # Create DataFrame and deduplicate
-        df = pd.DataFrame(orgs)
-        
-        if df.empty:
-            return df
+            frames.append(pd.DataFrame({
+                'name': responsible['organization'],
+                'agency_class': 'UNKNOWN',
+            }))
+        orgs = pd.concat(frames, ignore_index=True).astype(object)
+        orgs = orgs[orgs['name'].notna() & (orgs['name'] != '')]
+        
+        if orgs.empty:
+            return pd.DataFrame()
+        
+        # Normalize all names column-wise
+        df = pd.DataFrame({
+            'org_key': self.org_normalizer.normalize_key_series(orgs['name']),
+            'org_name': self.org_normalizer.normalize_series(orgs['name']),
+            'org_name_original': orgs['name'],
+            'agency_class': orgs['agency_class'],
+        })
         
         # Group by normalized key and take first occurrence
         staged = df.groupby('org_key').agg({
@@ -200,70 +304,43 @@ class StagedTransformer:
         Returns:
             Staged drugs DataFrame
         """
-        interventions = self._load_raw("interventions")
-        design_groups = self._load_raw("design_groups")
+        # Only drugs and biologicals, filtered while reading
+        drugs = self._load_raw(
+            "interventions",
+            columns=['id', 'nct_id', 'intervention_type', 'name', 'description'],
+            filters=[('intervention_type', 'in', ['DRUG', 'BIOLOGICAL'])],
+        )
+        design_groups = self._load_raw("design_groups", columns=['nct_id', 'description'])
         
-        if interventions is None or interventions.empty:
+        if drugs is None or drugs.empty:
             return pd.DataFrame()
         
-        # Filter to drugs and biologicals
-        drugs = interventions[
-            interventions['intervention_type'].isin(['DRUG', 'BIOLOGICAL'])
-        ].copy()
-        
-        # Create design group lookup by nct_id
-        design_group_desc = {}
+        # Combined design group descriptions per study
+        dg_desc_combined = pd.Series(None, index=drugs.index, dtype=object)
         if design_groups is not None and not design_groups.empty:
-            for _, row in design_groups.iterrows():
-                nct_id = row.get('nct_id')
-                desc = row.get('description', '')
-                if nct_id and desc:
-                    if nct_id not in design_group_desc:
-                        design_group_desc[nct_id] = []
-                    design_group_desc[nct_id].append(str(desc))
-        
-        # Transform each drug
-        staged_drugs = []
-        
-        for _, row in drugs.iterrows():
-            name = row.get('name', '')
-            description = row.get('description', '')
-            nct_id = row.get('nct_id', '')
-            
-            # Get design group descriptions for this study
-            dg_descs = design_group_desc.get(nct_id, [])
-            dg_desc_combined = ' '.join(dg_descs) if dg_descs else None
-            
-            # Normalize drug name
-            normalized_name = self.drug_normalizer.normalize(name)
-            drug_key = self.drug_normalizer.normalize_for_key(name)
-            
-            # Extract route
-            route = self.route_extractor.extract_primary(
-                name=name,
-                description=description,
-                design_group_desc=dg_desc_combined,
-            )
-            
-            # Extract dosage form
-            dosage_form = self.dosage_extractor.extract_primary(
-                name=name,
-                description=description,
-            )
-            
-            staged_drugs.append({
-                'intervention_id': row.get('id'),
-                'nct_id': nct_id,
-                'drug_key': drug_key,
-                'drug_name': normalized_name,
-                'drug_name_original': name,
-                'intervention_type': row.get('intervention_type'),
-                'description': description,
-                'route': route,
-                'dosage_form': dosage_form,
-            })
-        
-        staged = pd.DataFrame(staged_drugs)
+            dg = design_groups[['nct_id', 'description']].dropna()
+            dg = dg[(dg['nct_id'] != '') & (dg['description'] != '')]
+            dg_descs = dg['description'].astype(str).groupby(dg['nct_id'], observed=True).agg(' '.join)
+            dg_desc_combined = drugs['nct_id'].map(dg_descs).astype(object)
+        
+        name = drugs['name']
+        description = drugs['description']
+        
+        # Text prepared once and shared by both extractors
+        context = ExtractionContext.from_columns(name, description, dg_desc_combined)
+        
+        # Transform all drugs column-wise
+        staged = pd.DataFrame({
+            'intervention_id': drugs['id'],
+            'nct_id': drugs['nct_id'],
+            'drug_key': self.drug_normalizer.normalize_key_series(name),
+            'drug_name': self.drug_normalizer.normalize_series(name),
+            'drug_name_original': name,
+            'intervention_type': drugs['intervention_type'].astype(object),
+            'description': description,
+            'route': self.route_extractor.extract_primary_from_context(context),
+            'dosage_form': self.dosage_extractor.extract_primary_from_context(context),
+        }).reset_index(drop=True)
         
         # Calculate extraction stats
         route_coverage = (staged['route'].notna().sum() / len(staged) * 100) if len(staged) > 0 else 0
@@ -311,32 +388,47 @@ class StagedTransformer:
         Returns:
             DataFrame with trial-org relationships
         """
-        sponsors = self._load_raw("sponsors")
+        sponsors = self._load_raw("sponsors", columns=['nct_id', 'name', 'lead_or_collaborator'])
         if sponsors is None or sponsors.empty:
             return pd.DataFrame()
         
-        relationships = []
+        sponsors = sponsors[sponsors['name'].notna() & (sponsors['name'] != '')]
+        if sponsors.empty:
+            return pd.DataFrame()
         
-        for _, row in sponsors.iterrows():
-            nct_id = row.get('nct_id')
-            name = row.get('name', '')
-            role = row.get('lead_or_collaborator', 'unknown')
-            
-            if not name or pd.isna(name):
-                continue
-            
-            org_key = self.org_normalizer.normalize_for_key(name)
-            
-            relationships.append({
-                'nct_id': nct_id,
-                'org_key': org_key,
-                'relationship_type': 'SPONSORED_BY' if role == 'lead' else 'COLLABORATES_WITH',
-            })
+        # A missing role (null under the Arrow dtypes) counts as a collaborator
+        is_lead = sponsors.get('lead_or_collaborator', pd.Series('unknown', index=sponsors.index)).eq('lead')
+        is_lead = is_lead.fillna(False).to_numpy(dtype=bool)
+        
+        staged = pd.DataFrame({
+            'nct_id': sponsors['nct_id'],
+            'org_key': self.org_normalizer.normalize_key_series(sponsors['name']),
+            'relationship_type': np.where(is_lead, 'SPONSORED_BY', 'COLLABORATES_WITH'),
+        }).reset_index(drop=True)
         
-        staged = pd.DataFrame(relationships)
         logger.info("Created trial-org relationships", count=len(staged))
         return staged
     
+    def _transform_and_save(
+        self,
+        name: str,
+        transform_fn: Callable[[], pd.DataFrame],
+    ) -> Optional[Tuple[Path, int]]:
+        """
+        Run one entity transformation and save its staged output.
+        
+        Args:
+            name: Staged entity name
+            transform_fn: Transformation producing the staged DataFrame
+            
+        Returns:
+            Saved path and row count, or None if there was nothing to save
+        """
+        df = transform_fn()
+        if df is None or df.empty:
+            return None
+        return self._save_staged(df, name), len(df)
+    
     def transform_all(self) -> Dict[str, Any]:
         """
         Transform all data from raw to staged.
@@ -360,17 +452,31 @@ class StagedTransformer:
             ('trial_organizations', self.transform_trial_organizations),
         ]
         
-        for name, transform_fn in transformations:
-            try:
-                df = transform_fn()
-                if df is not None and not df.empty:
-                    filepath = self._save_staged(df, name)
+        # The entities read disjoint inputs; Parquet I/O and Arrow kernels
+        # release the GIL, so they overlap well on threads
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            futures = [
+                (name, pool.submit(self._transform_and_save, name, transform_fn))
+                for name, transform_fn in transformations
+            ]
+            
+            for name, future in futures:
+                try:
+                    saved = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to transform {name}", error=str(e))
+                    raise
+                if saved is not None:
+                    filepath, count = saved
                     stats['files'].append(str(filepath))
                     stats['tables_transformed'] += 1
-                    stats[f'{name}_count'] = len(df)
-            except Exception as e:
-                logger.error(f"Failed to transform {name}", error=str(e))
-                raise
+                    stats[f'{name}_count'] = count
+        
+        logger.debug(
+            "Normalizer cache usage",
+            organizations=self.org_normalizer.cache_info(),
+            drugs=self.drug_normalizer.cache_info(),
+        )
         
         logger.info("Staged transformation completed", **stats)
         return stats
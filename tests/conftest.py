@@ -0,0 +1,7 @@
+"""Shared pytest configuration."""
+
+
+def pytest_configure(config):
+    # Provided by pytest-timeout; registered here too so runs without the
+    # plugin don't warn about an unknown marker
+    config.addinivalue_line("markers", "timeout(seconds): fail the test if it runs longer than seconds")
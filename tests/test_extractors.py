@@ -1,5 +1,6 @@
 """Tests for route and dosage form extractors."""
 
+import pandas as pd
 import pytest
 
 from src.transformation.extractors import RouteExtractor, DosageFormExtractor
@@ -8,65 +9,25 @@ from src.transformation.extractors import RouteExtractor, DosageFormExtractor
 class TestRouteExtractor:
     """Tests for RouteExtractor."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def extractor(self):
         return RouteExtractor()
     
-    def test_extract_oral_from_description(self, extractor):
-        """Should extract oral route from description."""
-        result = extractor.extract_primary(
-            description="Administered orally once daily"
-        )
-        assert result == "ORAL"
-    
-    def test_extract_oral_abbreviation(self, extractor):
-        """Should extract oral from p.o. abbreviation."""
-        result = extractor.extract_primary(
-            description="Given p.o. twice daily"
-        )
-        assert result == "ORAL"
-    
-    def test_extract_intravenous(self, extractor):
-        """Should extract IV route."""
-        result = extractor.extract_primary(
-            description="Intravenous infusion over 2 hours"
-        )
-        assert result == "INTRAVENOUS"
-    
-    def test_extract_iv_abbreviation(self, extractor):
-        """Should extract IV from abbreviation."""
-        result = extractor.extract_primary(
-            description="Given IV q8h"
-        )
-        assert result == "INTRAVENOUS"
-    
-    def test_extract_subcutaneous(self, extractor):
-        """Should extract subcutaneous route."""
-        result = extractor.extract_primary(
-            description="Subcutaneous injection"
-        )
-        assert result == "SUBCUTANEOUS"
-    
-    def test_extract_intramuscular(self, extractor):
-        """Should extract intramuscular route."""
-        result = extractor.extract_primary(
-            description="Intramuscular injection in deltoid"
-        )
-        assert result == "INTRAMUSCULAR"
-    
-    def test_extract_topical(self, extractor):
-        """Should extract topical route."""
-        result = extractor.extract_primary(
-            description="Apply topically to affected area"
-        )
-        assert result == "TOPICAL"
-    
-    def test_extract_inhalation(self, extractor):
-        """Should extract inhalation route."""
-        result = extractor.extract_primary(
-            description="Inhaled via nebulizer"
-        )
-        assert result == "INHALATION"
+    @pytest.mark.parametrize("description,expected", [
+        pytest.param("Administered orally once daily", "ORAL", id="oral_from_description"),
+        pytest.param("Given p.o. twice daily", "ORAL", id="oral_abbreviation"),
+        pytest.param("Intravenous infusion over 2 hours", "INTRAVENOUS", id="intravenous"),
+        pytest.param("Given IV q8h", "INTRAVENOUS", id="iv_abbreviation"),
+        pytest.param("Subcutaneous injection", "SUBCUTANEOUS", id="subcutaneous"),
+        pytest.param("Intramuscular injection in deltoid", "INTRAMUSCULAR", id="intramuscular"),
+        pytest.param("Apply topically to affected area", "TOPICAL", id="topical"),
+        pytest.param("Inhaled via nebulizer", "INHALATION", id="inhalation"),
+        pytest.param("Rectal suppository", "RECTAL", id="rectal"),
+        pytest.param("Applied via transdermal patch", "TRANSDERMAL", id="transdermal"),
+    ])
+    def test_extract_route_from_description(self, extractor, description, expected):
+        """Should extract the route named in the description."""
+        assert extractor.extract_primary(description=description) == expected
     
     def test_extract_from_name(self, extractor):
         """Should extract route from drug name."""
@@ -116,90 +77,44 @@ class TestRouteExtractor:
         result = extractor.extract_primary()
         assert result is None
     
-    def test_rectal_route(self, extractor):
-        """Should extract rectal route."""
-        result = extractor.extract_primary(
-            description="Rectal suppository"
-        )
-        assert result == "RECTAL"
-    
-    def test_transdermal_route(self, extractor):
-        """Should extract transdermal route."""
-        result = extractor.extract_primary(
-            description="Applied via transdermal patch"
-        )
-        assert result == "TRANSDERMAL"
+    def test_extract_primary_column_matches_rows(self, extractor):
+        """Column extraction should agree with row-by-row extraction."""
+        name = pd.Series(["Oral Drug", None, "Placebo", "Gel"])
+        description = pd.Series(["Given intravenously", None, None, "Rectal suppository"])
+        design_group = pd.Series([None, "Subcutaneous injection", None, None])
+        
+        result = extractor.extract_primary_column(name, description, design_group)
+        
+        expected = [
+            extractor.extract_primary(n, d, g)
+            for n, d, g in zip(name, description, design_group)
+        ]
+        assert result.tolist() == expected == ["INTRAVENOUS", "SUBCUTANEOUS", None, "RECTAL"]
 
 
 class TestDosageFormExtractor:
     """Tests for DosageFormExtractor."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def extractor(self):
         return DosageFormExtractor()
     
-    def test_extract_tablet(self, extractor):
-        """Should extract tablet form."""
-        result = extractor.extract_primary(
-            name="Drug Tablet"
-        )
-        assert result == "TABLET"
-    
-    def test_extract_tablet_plural(self, extractor):
-        """Should extract tablets (plural)."""
-        result = extractor.extract_primary(
-            description="Two tablets daily"
-        )
-        assert result == "TABLET"
-    
-    def test_extract_capsule(self, extractor):
-        """Should extract capsule form."""
-        result = extractor.extract_primary(
-            name="Drug 100mg Capsule"
-        )
-        assert result == "CAPSULE"
-    
-    def test_extract_injection(self, extractor):
-        """Should extract injection form."""
-        result = extractor.extract_primary(
-            description="Given as injection"
-        )
-        assert result == "INJECTION"
-    
-    def test_extract_solution(self, extractor):
-        """Should extract solution form."""
-        result = extractor.extract_primary(
-            name="Drug Oral Solution"
-        )
-        assert result == "SOLUTION"
-    
-    def test_extract_cream(self, extractor):
-        """Should extract cream form."""
-        result = extractor.extract_primary(
-            description="Apply cream twice daily"
-        )
-        assert result == "CREAM"
-    
-    def test_extract_patch(self, extractor):
-        """Should extract patch form."""
-        result = extractor.extract_primary(
-            name="Nicotine Patch"
-        )
-        assert result == "PATCH"
-    
-    def test_extract_inhaler(self, extractor):
-        """Should extract inhaler form."""
-        result = extractor.extract_primary(
-            description="Administered via inhaler"
-        )
-        assert result == "INHALER"
-    
-    def test_extract_drops(self, extractor):
-        """Should extract drops form."""
-        result = extractor.extract_primary(
-            name="Eye Drops"
-        )
-        assert result == "DROPS"
+    @pytest.mark.parametrize("field,text,expected", [
+        pytest.param("name", "Drug Tablet", "TABLET", id="tablet"),
+        pytest.param("description", "Two tablets daily", "TABLET", id="tablet_plural"),
+        pytest.param("name", "Drug 100mg Capsule", "CAPSULE", id="capsule"),
+        pytest.param("description", "Given as injection", "INJECTION", id="injection"),
+        pytest.param("name", "Drug Oral Solution", "SOLUTION", id="solution"),
+        pytest.param("description", "Apply cream twice daily", "CREAM", id="cream"),
+        pytest.param("name", "Nicotine Patch", "PATCH", id="patch"),
+        pytest.param("description", "Administered via inhaler", "INHALER", id="inhaler"),
+        pytest.param("name", "Eye Drops", "DROPS", id="drops"),
+        pytest.param("description", "Rectal suppository", "SUPPOSITORY", id="suppository"),
+        pytest.param("description", "IV infusion bag", "INFUSION", id="infusion"),
+    ])
+    def test_extract_form(self, extractor, field, text, expected):
+        """Should extract the dosage form named in the name or description."""
+        assert extractor.extract_primary(**{field: text}) == expected
     
     def test_no_match_returns_none(self, extractor):
         """Should return None when no form found."""
@@ -223,17 +138,12 @@ class TestDosageFormExtractor:
         result = extractor.extract_primary()
         assert result is None
     
-    def test_suppository(self, extractor):
-        """Should extract suppository form."""
-        result = extractor.extract_primary(
-            description="Rectal suppository"
-        )
-        assert result == "SUPPOSITORY"
-    
-    def test_infusion(self, extractor):
-        """Should extract infusion form."""
-        result = extractor.extract_primary(
-            description="IV infusion bag"
-        )
-        assert result == "INFUSION"
-
+    def test_extract_primary_column_matches_rows(self, extractor):
+        """Column extraction should agree with row-by-row extraction."""
+        name = pd.Series(["Aspirin Tablets", "Saline", None])
+        description = pd.Series(["Topical cream", None, None])
+        
+        result = extractor.extract_primary_column(name, description)
+        
+        expected = [extractor.extract_primary(n, d) for n, d in zip(name, description)]
+        assert result.tolist() == expected == ["CREAM", None, None]
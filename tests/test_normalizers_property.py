@@ -0,0 +1,118 @@
+"""Property-based tests for normalizers."""
+
+import re
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from src.transformation.normalizers import OrganizationNormalizer, DrugNormalizer
+
+
+# Keys keep only lowercase ASCII letters and digits (plus hyphens for
+# drugs), in single-space separated words
+ORG_KEY_RE = re.compile(r'[a-z0-9]+(?: [a-z0-9]+)*')
+DRUG_KEY_RE = re.compile(r'[a-z0-9\-]+(?: [a-z0-9\-]+)*')
+
+# Realistic-ish names: words, legal suffixes, dosages and punctuation
+name_parts = st.sampled_from([
+    "Pfizer", "Merck", "Aspirin", "Inc.", "Ltd", "Corp.", "L.L.C.", "GmbH", "S.p.A.",
+    "100mg", "5 ml", "100/5mg", "(200 mg)", "0.5%", ",", ".", "-", " ", "  ", "\t",
+])
+names = st.one_of(
+    st.text(max_size=200),
+    st.lists(name_parts, max_size=12).map("".join),
+)
+
+# Long digit and whitespace runs, the inputs that made the patterns quadratic
+pathological = st.builds(
+    lambda head, run, tail: head + run + tail,
+    st.sampled_from(["Drug ", "Drug (", "Acme", "Acme, "]),
+    st.sampled_from(["1", " ", "1.", ", "]).flatmap(
+        lambda unit: st.integers(1000, 20000).map(lambda n: unit * n)
+    ),
+    st.sampled_from(["", "/mg", "%", "x", "Inc"]),
+)
+
+# Keys are not idempotent, so there is no normalize_for_key(key) == key
+# property: organization keys drop one legal suffix per pass ("Acme Inc Ltd"
+# -> "acme inc" -> "acme"), and drug keys strip dosages before punctuation,
+# so removing the punctuation can join a new dosage ("Aspirin 5.g" ->
+# "aspirin 5g" -> "aspirin"). Both match the original normalizers, and
+# changing them would change the graph's deduplication keys.
+
+
+class TestOrganizationNormalizerProperties:
+    """Invariants of OrganizationNormalizer over arbitrary input."""
+    
+    @pytest.fixture(scope="module")
+    def normalizer(self):
+        return OrganizationNormalizer()
+    
+    @given(name=names)
+    def test_normalize_collapses_whitespace_and_never_grows(self, normalizer, name):
+        """Normalized names are whitespace-collapsed and no longer than the input."""
+        normalized = normalizer.normalize(name)
+        assert normalized == " ".join(normalized.split())
+        assert len(normalized) <= len(name)
+    
+    @given(name=names)
+    def test_key_is_lowercase_alphanumeric_words(self, normalizer, name):
+        """Keys are empty or lowercase alphanumeric words."""
+        key = normalizer.normalize_for_key(name)
+        assert key == "" or ORG_KEY_RE.fullmatch(key)
+    
+    @given(values=st.lists(st.one_of(st.none(), names), max_size=20))
+    def test_series_methods_match_scalar(self, normalizer, values):
+        """Column normalization agrees with per-name normalization."""
+        column = pd.Series(values, dtype=object)
+        assert normalizer.normalize_series(column).tolist() == [normalizer.normalize(v) for v in values]
+        assert normalizer.normalize_key_series(column).tolist() == [
+            normalizer.normalize_for_key(v) for v in values
+        ]
+    
+    @pytest.mark.timeout(60)
+    @settings(deadline=None, max_examples=20)
+    @given(name=pathological)
+    def test_pathological_names_finish_quickly(self, normalizer, name):
+        """Long runs never push the suffix search into quadratic time."""
+        normalizer.normalize_for_key(name)
+
+
+class TestDrugNormalizerProperties:
+    """Invariants of DrugNormalizer over arbitrary input."""
+    
+    @pytest.fixture(scope="module")
+    def normalizer(self):
+        return DrugNormalizer()
+    
+    @given(name=names)
+    def test_normalize_collapses_whitespace_and_never_grows(self, normalizer, name):
+        """Normalized names are whitespace-collapsed and no longer than the input."""
+        normalized = normalizer.normalize(name)
+        assert normalized == " ".join(normalized.split())
+        assert len(normalized) <= len(name)
+    
+    @given(name=names)
+    def test_key_is_lowercase_alphanumeric_words(self, normalizer, name):
+        """Keys are empty or lowercase alphanumeric/hyphen words."""
+        key = normalizer.normalize_for_key(name)
+        assert key == "" or DRUG_KEY_RE.fullmatch(key)
+    
+    @given(values=st.lists(st.one_of(st.none(), names), max_size=20))
+    def test_series_methods_match_scalar(self, normalizer, values):
+        """Column normalization agrees with per-name normalization."""
+        column = pd.Series(values, dtype=object)
+        assert normalizer.normalize_series(column).tolist() == [normalizer.normalize(v) for v in values]
+        assert normalizer.normalize_key_series(column).tolist() == [
+            normalizer.normalize_for_key(v) for v in values
+        ]
+    
+    @pytest.mark.timeout(60)
+    @settings(deadline=None, max_examples=20)
+    @given(name=pathological)
+    def test_pathological_names_finish_quickly(self, normalizer, name):
+        """Long runs never push the dosage patterns into quadratic time."""
+        normalizer.normalize_for_key(name)
@@ -0,0 +1,33 @@
+"""Tests for the staged transformer."""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.transformation import StagedTransformer
+
+
+class TestTrialOrganizations:
+    """Tests for StagedTransformer.transform_trial_organizations."""
+    
+    @pytest.fixture
+    def transformer(self, tmp_path):
+        raw_path = tmp_path / "raw"
+        raw_path.mkdir()
+        return StagedTransformer(raw_path=raw_path, staged_path=tmp_path / "staged")
+    
+    def test_null_role_is_collaborator(self, transformer):
+        """A sponsor without lead_or_collaborator should be a collaborator."""
+        sponsors = pa.table({
+            "nct_id": ["NCT00000001", "NCT00000001", "NCT00000002"],
+            "name": ["Pfizer Inc.", "Merck Corp.", "Bayer AG"],
+            "lead_or_collaborator": ["lead", None, "collaborator"],
+        })
+        pq.write_table(sponsors, transformer.raw_path / "sponsors_20250101_000000.parquet")
+        
+        staged = transformer.transform_trial_organizations()
+        
+        assert staged["relationship_type"].tolist() == [
+            "SPONSORED_BY", "COLLABORATES_WITH", "COLLABORATES_WITH",
+        ]
+        assert staged["org_key"].tolist() == ["pfizer", "merck", "bayer"]